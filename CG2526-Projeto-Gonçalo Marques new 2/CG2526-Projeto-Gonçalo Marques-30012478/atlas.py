@@ -0,0 +1,115 @@
+import os
+import json
+import argparse
+
+if __name__ == "__main__":
+    # A construção do atlas não precisa de janela
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from configuracoes import *
+from funcionalidades import _load_image_from_disk, find_asset_path, file_hash
+from entidades import ENTITY_IMAGES
+
+# Espaço (px) entre sprites no atlas
+ATLAS_PADDING = 1
+
+def atlas_specs():
+    """Sprites a incluir: as imagens das entidades nos tamanhos definidos em configuracoes.
+
+    As variantes com efeito são geradas em runtime a partir destas.
+    """
+    specs = []
+    for spec in ENTITY_IMAGES:
+        path, size, flip_x, flip_y = spec[:4]
+        if len(spec) > 4 and spec[4]:
+            continue
+        specs.append((path, size, flip_x, flip_y))
+    return specs
+
+def render_sprite(path, size, flip_x, flip_y):
+    """Superfície final de um sprite, escalada e espelhada como load_image a faria."""
+    img = _load_image_from_disk(path, size, (ASSET_DIR, IMAGES_DIR), flip_x, flip_y, (150, 150, 150))
+    if size is None:
+        # Textura sem tamanho fixo (troncos): guarda-se já reduzida à maior altura usada
+        w, h = img.get_size()
+        if h > CACTUS_MAX_HEIGHT:
+            img = pygame.transform.scale(img, (max(1, int(w * CACTUS_MAX_HEIGHT / h)), CACTUS_MAX_HEIGHT))
+    return img
+
+def pack_shelves(sizes, max_width, padding=ATLAS_PADDING):
+    """Empacota retângulos em prateleiras (mais altos primeiro); devolve (posições, largura, altura)."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf_h = used_w = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_width:
+            y += shelf_h + padding
+            x = shelf_h = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x - padding)
+    return positions, used_w, y + shelf_h
+
+def build_atlas(image_path=ATLAS_IMAGE, manifest_path=ATLAS_MANIFEST, max_width=1024):
+    """Gera o atlas e o manifesto; devolve o manifesto."""
+    specs = atlas_specs()
+    sprites = [render_sprite(*spec) for spec in specs]
+    positions, width, height = pack_shelves([s.get_size() for s in sprites], max_width)
+
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    entries = []
+    sources = {}
+    for (path, size, flip_x, flip_y), surf, pos in zip(specs, sprites, positions):
+        atlas.blit(surf, pos)
+        entries.append({
+            "path": path,
+            "size": list(size) if size else None,
+            "flip_x": flip_x,
+            "flip_y": flip_y,
+            "rect": [pos[0], pos[1], surf.get_width(), surf.get_height()],
+        })
+        full = find_asset_path(path)
+        if full:
+            sources[path] = file_hash(full)
+
+    pygame.image.save(atlas, image_path)
+    manifest = {"version": 1, "image": os.path.basename(image_path), "sources": sources, "sprites": entries}
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def check_atlas(manifest_path=ATLAS_MANIFEST):
+    """Compara o hash de cada PNG de origem com o manifesto; devolve os que mudaram."""
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    stale = []
+    for path, digest in manifest["sources"].items():
+        full = find_asset_path(path)
+        if full is None or file_hash(full) != digest:
+            stale.append(path)
+    return stale
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o atlas de sprites pré-escalados")
+    parser.add_argument("--max-width", type=int, default=1024, help="largura máxima do atlas (px)")
+    parser.add_argument("--check", action="store_true",
+                        help="só verifica (por hash) se o atlas está atualizado com os PNG de origem")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stale = check_atlas()
+        if stale:
+            parser.exit(1, "Atlas desatualizado: " + ", ".join(stale) + "\n")
+        print(f"Atlas atualizado ({ATLAS_MANIFEST})")
+        return
+
+    pygame.display.set_mode((1, 1))
+    manifest = build_atlas(max_width=args.max_width)
+    size = os.path.getsize(ATLAS_IMAGE)
+    print(f"{len(manifest['sprites'])} sprites -> {ATLAS_IMAGE} ({size // 1024} KB), {ATLAS_MANIFEST}")
+
+if __name__ == "__main__":
+    main()
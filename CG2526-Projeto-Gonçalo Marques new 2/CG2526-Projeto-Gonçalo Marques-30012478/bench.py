@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import math
+import time
+import timeit
+import platform
+import argparse
+import tracemalloc
+
+if __name__ == "__main__":
+    # Benchmarks sem janela: o driver "dummy" tem de ser escolhido antes de iniciar o pygame
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import configuracoes
+from configuracoes import *
+from entrada import ScriptedInput
+from nivel import Nivel, load_level_assets
+from simulacao import DEFAULT_SCRIPT, init_headless_display
+
+BENCH_SEED = 1234
+BENCH_TICKS = 3000
+# Ticks medidos com tracemalloc (muito mais lento, por isso numa passagem curta à parte)
+BENCH_ALLOC_TICKS = 300
+# Repetições de cada medição; as dos cenários são intercaladas (uma volta por todos os
+# cenários de cada vez) para um abrandamento passageiro da máquina não cair só num deles
+BENCH_REPEATS = 7
+# Piora relativa a partir da qual cada métrica conta como regressão; o p99 depende
+# de poucos ticks e varia mais entre corridas, por isso tem mais margem. O limite
+# sobe ainda até ao ruído medido nas repetições (ver compare)
+BENCH_THRESHOLDS = {
+    "ticks_per_second": 0.10,
+    "p99_tick_us": 0.25,
+    "allocs_per_tick": 0.10,
+    "peak_bytes_per_tick": 0.10,
+    "us_per_call": 0.10,
+}
+# Diferença absoluta abaixo da qual não há regressão: as contagens de memória são
+# pequenas e variam alguns blocos/bytes entre corridas
+BENCH_MIN_DELTA = {
+    "allocs_per_tick": 1.0,
+    "peak_bytes_per_tick": 64,
+}
+
+def _scenarios():
+    """Cenários fixos: (nome, nível, guião, opções do Nivel, powerup permanente)."""
+    scenarios = []
+    for level, distance in sorted(LEVEL_DISTANCES.items()):
+        scenarios.append((f"level{level}", level, DEFAULT_SCRIPT, {}, False))
+    # Boss com o jogador sempre a disparar
+    scenarios.append(("boss_fire", 5, "x@0/1,w@0-8/45", {}, True))
+    # Muitos obstáculos em simultâneo
+    scenarios.append(("spawn_heavy", 4, DEFAULT_SCRIPT, {"spawn_scale": 4.0}, False))
+    return scenarios
+
+def _make_level(assets, level, options, powerup, seed=BENCH_SEED):
+    bg, ground_surface, ground_y = assets
+    nivel = Nivel(level, bg, ground_surface, ground_y, seed=seed, invulnerable=True, **options)
+    if powerup:
+        nivel.gato.activate_powerup(10 ** 6)
+    return nivel
+
+def _run_ticks(nivel, script, ticks, per_tick=None):
+    """Corre `ticks` ticks do nível; per_tick(nivel) é chamado depois de cada um."""
+    source = ScriptedInput.parse(script)
+    for _ in range(ticks):
+        user_input, taps = source.poll(nivel.ticks)
+        if pygame.K_x in taps:
+            nivel.request_shot()
+        if nivel.tick(user_input) == "complete":
+            return
+        if per_tick:
+            per_tick(nivel)
+
+def _timed_run(assets, level, script, options, powerup, ticks):
+    """Uma passagem cronometrada; devolve (tempos por tick em ns, segundos, máx. de entidades)."""
+    nivel = _make_level(assets, level, options, powerup)
+    times = []
+    last = [time.perf_counter_ns()]
+    max_entities = [0]
+
+    def lap(nivel):
+        now = time.perf_counter_ns()
+        times.append(now - last[0])
+        n = len(nivel.obstacles) + len(nivel.bullets) + len(nivel.boss_bullets)
+        if n > max_entities[0]:
+            max_entities[0] = n
+        last[0] = time.perf_counter_ns()
+
+    start = time.perf_counter()
+    last[0] = time.perf_counter_ns()
+    _run_ticks(nivel, script, ticks, lap)
+    elapsed = time.perf_counter() - start
+    times.sort()
+    return times, elapsed, max_entities[0]
+
+def _percentile_us(times, q):
+    n = len(times)
+    return times[max(0, math.ceil(q * n) - 1)] / 1000 if n else 0.0
+
+def _summary(values):
+    """Mediana das repetições e o ruído: meia amplitude interquartil relativa à mediana."""
+    values = sorted(values)
+    n = len(values)
+    median = values[n // 2]
+    spread = (values[(3 * n) // 4] - values[n // 4]) / 2
+    return median, spread / median if median else 0.0
+
+def _calibrate():
+    """Tempo (µs) de uma carga fixa em Python puro: a velocidade da máquina no momento.
+
+    run_bench guarda a mediana das calibrações feitas entre passagens; compare
+    corrige os tempos pela razão entre as duas, para um abrandamento da máquina
+    inteira (outro processo, frequência do CPU) não parecer uma regressão.
+    """
+    start = time.perf_counter()
+    total = 0
+    for i in range(50000):
+        total += i * i % 7
+    return (time.perf_counter() - start) * 1e6
+
+def _alloc_run(assets, level, script, options, powerup, ticks):
+    """Passagem com tracemalloc; devolve (blocos novos por tick, pico de bytes por tick).
+
+    Os blocos novos são a soma, por linha de origem, do aumento do número de blocos
+    entre snapshots no início e no fim de cada tick (o que o tick alocou e ficou vivo).
+    O pico apanha também a memória temporária, libertada dentro do tick.
+    """
+    nivel = _make_level(assets, level, options, powerup)
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    blocks = []
+    peaks = []
+
+    def measure(_):
+        peaks.append(tracemalloc.get_traced_memory()[1] - base[0])
+        snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        blocks.append(sum(max(0, s.count_diff) for s in snapshot.compare_to(last[0], "lineno")))
+        last[0] = snapshot
+        # O snapshot também aloca: o pico do tick seguinte conta a partir daqui
+        tracemalloc.reset_peak()
+        base[0] = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.start()
+    last = [tracemalloc.take_snapshot().filter_traces(filters)]
+    base = [tracemalloc.get_traced_memory()[0]]
+    tracemalloc.reset_peak()
+    _run_ticks(nivel, script, ticks, measure)
+    tracemalloc.stop()
+    n = len(blocks)
+    return (sum(blocks) / n, sum(peaks) / n) if n else (0.0, 0.0)
+
+def run_scenario(assets, name, level, script, options, powerup, runs, alloc_ticks=BENCH_ALLOC_TICKS):
+    """Métricas de um cenário a partir das passagens cronometradas (runs, de _timed_run).
+
+    ticks/s e percentis são a mediana das repetições; "noise" guarda o ruído de
+    cada um, usado por compare como limite mínimo.
+    """
+    tps, tps_noise = _summary([len(t) / e if e > 0 else float("inf") for t, e, _ in runs])
+    p50, _ = _summary([_percentile_us(t, 0.5) for t, _, _ in runs])
+    p99, p99_noise = _summary([_percentile_us(t, 0.99) for t, _, _ in runs])
+    allocs, peak = _alloc_run(assets, level, script, options, powerup, alloc_ticks)
+    return {
+        "ticks": len(runs[0][0]),
+        "ticks_per_second": tps,
+        "p50_tick_us": p50,
+        "p99_tick_us": p99,
+        "allocs_per_tick": allocs,
+        "peak_bytes_per_tick": peak,
+        "max_entities": max(r[2] for r in runs),
+        "noise": {"ticks_per_second": tps_noise, "p99_tick_us": p99_noise},
+    }
+
+def _micro(fn, number, calibration, repeats=BENCH_REPEATS):
+    """Mediana de `repeats` repetições, em µs por chamada (com o ruído, como nos cenários)."""
+    runs = []
+    for _ in range(repeats):
+        runs.append(timeit.timeit(fn, number=number) / number * 1e6)
+        calibration.append(_calibrate())
+    median, noise = _summary(runs)
+    return {"us_per_call": median, "noise": {"us_per_call": noise}}
+
+def run_micro(assets, calibration):
+    """Micro-benchmarks isolados das funções mais usadas ao carregar e desenhar.
+
+    Acrescenta a calibration uma calibração depois de cada repetição.
+    """
+    from entidades import Tronco
+    from funcionalidades import IMAGE_CACHE, load_image, detect_ground_y_from_bg
+    import random
+    bg = assets[0]
+    rng = random.Random(BENCH_SEED)
+    nivel = _make_level(assets, 3, {}, True)
+    _run_ticks(nivel, DEFAULT_SCRIPT, 600)
+    target = pygame.Surface((WIDTH, HEIGHT)).convert()
+
+    def load_uncached():
+        # Caminho completo de load_image: atlas ou disco, e optimize_surface
+        IMAGE_CACHE.clear()
+        return load_image("fireball.png", FIREBALL_SIZE)
+
+    return {
+        "Tronco()": _micro(lambda: Tronco(rng), 2000, calibration),
+        "load_image (cache)": _micro(lambda: load_image("fireball.png", FIREBALL_SIZE), 20000, calibration),
+        "load_image (sem cache)": _micro(load_uncached, 5, calibration),
+        "detect_ground_y_from_bg": _micro(lambda: detect_ground_y_from_bg(bg), 5, calibration),
+        "DESENHO": _micro(lambda: nivel.draw(target, 0.5), 50, calibration),
+    }
+
+def run_bench(quick=False, only=None, repeats=BENCH_REPEATS):
+    init_headless_display()
+    assets = load_level_assets()
+    ticks = BENCH_TICKS // 5 if quick else BENCH_TICKS
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "seed": BENCH_SEED,
+            "ticks": ticks,
+            "size": [WIDTH, HEIGHT],
+            "entity_store": configuracoes.ENTITY_STORE,
+        },
+        "scenarios": {},
+        "micro": {},
+    }
+    calibration = [_calibrate()]
+    selected = [s for s in _scenarios() if not only or s[0] in only]
+    runs = {s[0]: [] for s in selected}
+    for _ in range(repeats):
+        for name, level, script, options, powerup in selected:
+            runs[name].append(_timed_run(assets, level, script, options, powerup, ticks))
+            calibration.append(_calibrate())
+    for scenario in selected:
+        results["scenarios"][scenario[0]] = run_scenario(assets, *scenario, runs[scenario[0]])
+    if not only or "micro" in only:
+        results["micro"] = run_micro(assets, calibration)
+    results["meta"]["calibration_us"] = _summary(calibration)[0]
+    return results
+
+# Métricas de tempo, corrigidas pela calibração da máquina em compare
+TIMED_METRICS = ("ticks_per_second", "p99_tick_us", "us_per_call")
+
+# Métricas comparadas com a baseline: True = maior é melhor
+COMPARED_METRICS = {
+    "ticks_per_second": True,
+    "p99_tick_us": False,
+    "allocs_per_tick": False,
+    "peak_bytes_per_tick": False,
+    "us_per_call": False,
+}
+
+def compare(results, baseline, threshold=None):
+    """Compara com a baseline; devolve [(grupo, nome, métrica, base, atual, variação, regressão)].
+
+    Cada métrica usa o seu limite de BENCH_THRESHOLDS (ou threshold, se dado), subido
+    até ao ruído somado das duas medições quando este for maior; diferenças abaixo
+    de BENCH_MIN_DELTA nunca contam. Os tempos atuais são passados à velocidade da
+    máquina da baseline pela razão entre as calibrações (ver _calibrate).
+    """
+    rows = []
+    old_cal = baseline.get("meta", {}).get("calibration_us")
+    new_cal = results.get("meta", {}).get("calibration_us")
+    speed = old_cal / new_cal if old_cal and new_cal else 1.0
+    for group in ("scenarios", "micro"):
+        for name, metrics in results.get(group, {}).items():
+            base_metrics = baseline.get(group, {}).get(name)
+            if not base_metrics:
+                continue
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                if metric not in metrics or not base_metrics.get(metric):
+                    continue
+                old, new = base_metrics[metric], metrics[metric]
+                if metric in TIMED_METRICS:
+                    new = new / speed if higher_is_better else new * speed
+                change = (new - old) / old
+                worse = -change if higher_is_better else change
+                limit = BENCH_THRESHOLDS[metric] if threshold is None else threshold
+                noise = metrics.get("noise", {}).get(metric, 0.0) + base_metrics.get("noise", {}).get(metric, 0.0)
+                limit = max(limit, noise)
+                regressed = worse > limit and abs(new - old) > BENCH_MIN_DELTA.get(metric, 0)
+                rows.append((group, name, metric, old, new, change, regressed))
+    return rows
+
+def print_results(results):
+    for name, m in results["scenarios"].items():
+        print(f"{name:<14} {m['ticks_per_second']:>9.0f} ticks/s  p99 {m['p99_tick_us']:>8.1f} µs  "
+              f"{m['allocs_per_tick']:>6.1f} blocos/tick  pico {m['peak_bytes_per_tick']:>9.0f} B/tick")
+    for name, m in results["micro"].items():
+        print(f"{name:<24} {m['us_per_call']:>10.1f} µs/chamada")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks reprodutíveis (semente fixa, sem ecrã)")
+    parser.add_argument("--out", metavar="FICHEIRO", help="guarda os resultados em JSON")
+    parser.add_argument("--baseline", metavar="FICHEIRO", help="compara com resultados guardados")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="piora relativa considerada regressão em todas as métricas "
+                             "(0.10 = 10%%; por omissão, o limite de cada métrica)")
+    parser.add_argument("--quick", action="store_true", help="cenários 5x mais curtos")
+    parser.add_argument("--repeats", type=int, default=BENCH_REPEATS,
+                        help="passagens por cenário (conta a mediana)")
+    parser.add_argument("--only", nargs="+", metavar="NOME", help="corre só estes cenários (ou 'micro')")
+    parser.add_argument("--entity-store", choices=("objects", "numpy"), default=None,
+                        help="contentor das entidades: um objeto por entidade ou arrays NumPy")
+    args = parser.parse_args(argv)
+    if args.entity_store:
+        configuracoes.ENTITY_STORE = args.entity_store
+
+    results = run_bench(args.quick, args.only, args.repeats)
+    print_results(results)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        regressions = [r for r in rows if r[6]]
+        for group, name, metric, old, new, change, regressed in rows:
+            flag = "REGRESSÃO" if regressed else ""
+            print(f"{name:<24} {metric:<22} {old:>12.1f} -> {new:>12.1f} ({change:+.1%}) {flag}")
+        if regressions:
+            print(f"{len(regressions)} regressões.")
+            return 1
+        print("Sem regressões.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
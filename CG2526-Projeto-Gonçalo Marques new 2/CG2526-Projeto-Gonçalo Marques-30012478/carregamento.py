@@ -0,0 +1,167 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from configuracoes import *
+from funcionalidades import (
+    IMAGE_CACHE, FILE_HASHES, image_key, find_asset_path, decode_image, prepare_image, finish_image, load_image,
+    load_image_variant, read_atlas_manifest, set_sprite_atlas, SpriteAtlas, get_ground_info
+)
+from entidades import ENTITY_IMAGES, TRONCO_BANK
+
+class AssetPreloader:
+    """Carrega os assets de jogo em segundo plano enquanto o menu está ativo.
+
+    Os ficheiros são lidos, descodificados e escalados numa pool de threads; o
+    thread principal só faz a conversão para o formato do ecrã e os passos
+    finais (sprites do atlas, variantes, chão, cada tronco do banco), um a um,
+    em fatias curtas chamando poll().
+    """
+
+    def __init__(self, workers=PRELOAD_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preload")
+        self.pending = []   # (future, finish(resultado), fallback()) por terminar no thread principal
+        self.steps = []     # passos no thread principal depois de todas as imagens
+        self.total = 0
+        self.done = 0
+        # Passo mais lento visto por tipo ("finish" de uma thread, "step" do thread principal)
+        self.slowest_ms = {}
+
+    def submit(self, work, finish, fallback):
+        """work corre numa thread; finish(resultado) corre depois no thread principal.
+
+        Se work falhar, o erro é registado e fallback() carrega o asset de forma síncrona.
+        """
+        self.pending.append((self.executor.submit(work), finish, fallback))
+        self.total += 1
+
+    def add_step(self, step):
+        self.steps.append(step)
+        self.total += 1
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+    def _finish_one(self, future, finish, fallback):
+        self.pending.remove((future, finish, fallback))
+        try:
+            result = future.result()
+        except Exception as e:
+            print("Erro no carregamento em segundo plano:", e)
+            fallback()
+        else:
+            finish(result)
+        self.done += 1
+
+    def _run_step(self):
+        self.steps.pop(0)()
+        self.done += 1
+
+    def poll(self, budget_ms=PRELOAD_POLL_BUDGET_MS):
+        """Termina o trabalho já pronto sem exceder budget_ms; devolve True quando acabou.
+
+        Cada chamada faz pelo menos um passo; os seguintes só começam se o
+        tempo que resta chegar para o passo mais lento do mesmo tipo (um tipo
+        ainda sem medições conta como se precisasse do orçamento todo).
+        """
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        now = start
+        while True:
+            ready = next((item for item in self.pending if item[0].done()), None)
+            if ready:
+                kind = "finish"
+            elif not self.pending and self.steps:
+                kind = "step"
+            else:
+                break
+            if now > start and (deadline - now) * 1000.0 < self.slowest_ms.get(kind, budget_ms):
+                break
+            if ready:
+                self._finish_one(*ready)
+            else:
+                self._run_step()
+            before, now = now, time.perf_counter()
+            self.slowest_ms[kind] = max(self.slowest_ms.get(kind, 0.0), (now - before) * 1000.0)
+        if self.finished:
+            self.executor.shutdown(wait=False)
+        return self.finished
+
+    def wait(self):
+        """Bloqueia até todos os assets estarem prontos."""
+        while self.pending:
+            wait([item[0] for item in self.pending])
+            for item in list(self.pending):
+                self._finish_one(*item)
+        while self.steps:
+            self._run_step()
+        self.executor.shutdown(wait=False)
+
+def _submit_disk_image(loader, key):
+    full = find_asset_path(key[0])
+    load = lambda: load_image(key[0], key[1], flip_x=key[2], flip_y=key[3])
+    if full is None:
+        # Ficheiro em falta: load_image devolve a superfície de recurso
+        loader.add_step(load)
+        return
+    loader.submit(lambda: prepare_image(full, key), lambda prepared: finish_image(key, prepared), load)
+
+def schedule_level_assets(loader):
+    """Agenda tudo o que load_level_assets precisa (ver nivel.load_level_assets)."""
+    keys = []
+    variants = []
+    for spec in ENTITY_IMAGES:
+        path, size, flip_x, flip_y = spec[:4]
+        if len(spec) > 4 and spec[4]:
+            variants.append(spec)
+        else:
+            keys.append(image_key(path, size, flip_x, flip_y))
+
+    def read_atlas():
+        manifest = read_atlas_manifest()
+        return (manifest, decode_image(ATLAS_IMAGE)) if manifest else None
+
+    def finish_atlas(result):
+        # Os hashes calculados na thread só são gravados aqui, no thread principal
+        FILE_HASHES.save()
+        atlas = SpriteAtlas.from_manifest(result[0], result[1].convert_alpha()) if result else None
+        set_sprite_atlas(atlas)
+        # Cada sprite do atlas é um passo; o que o atlas não tiver é descodificado do PNG original
+        for key in keys:
+            if atlas and atlas.get(key) is not None:
+                loader.add_step(lambda k=key: load_image(k[0], k[1], flip_x=k[2], flip_y=k[3]))
+            else:
+                _submit_disk_image(loader, key)
+
+    # Sem atlas legível, todas as imagens vêm dos PNG originais
+    loader.submit(read_atlas, finish_atlas, lambda: finish_atlas(None))
+    bg_key = image_key("game_bg.png", (WIDTH, HEIGHT))
+    _submit_disk_image(loader, bg_key)
+
+    for path, size, flip_x, flip_y, effect in variants:
+        loader.add_step(lambda p=path, s=size, fx=flip_x, fy=flip_y, e=effect: load_image_variant(p, s, fx, fy, e))
+    loader.add_step(lambda: get_ground_info("game_bg.png", IMAGE_CACHE.get(bg_key)))
+    for w in TRONCO_BANK.widths:
+        for h in TRONCO_BANK.heights:
+            loader.add_step(lambda w=w, h=h: TRONCO_BANK.get(w, h))
+
+_PRELOADER = []
+
+def start_preload():
+    """Começa a carregar os assets de jogo em segundo plano e devolve o loader."""
+    loader = AssetPreloader()
+    schedule_level_assets(loader)
+    _PRELOADER[:] = [loader]
+    return loader
+
+def preloader():
+    """Loader em curso (None se não houver carregamento ativo)."""
+    return _PRELOADER[0] if _PRELOADER else None
+
+def finish_preload():
+    """Espera pelo carregamento em segundo plano, se existir (antes de iniciar um nível)."""
+    if _PRELOADER:
+        _PRELOADER.pop().wait()
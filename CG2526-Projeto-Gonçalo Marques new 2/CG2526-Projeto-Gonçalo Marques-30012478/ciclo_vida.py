@@ -0,0 +1,36 @@
+import pygame
+from configuracoes import *
+
+class LifetimeManager:
+    """Tempo de vida e visibilidade das entidades dinâmicas do nível.
+
+    despawn(grupo) remove as entidades que já não tocam no ecrã alargado por
+    DESPAWN_MARGIN (o mesmo critério para todos os tipos); draw(...) só desenha
+    as que podem aparecer no ecrã e conta vivas, desenhadas e cortadas para a
+    instrumentação. Os grupos são EntityList/Pool ou as stores de entidades_vetor.
+    """
+
+    def __init__(self, margin=DESPAWN_MARGIN):
+        self.view = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        self.bounds = self.view.inflate(2 * margin, 2 * margin)
+        self.live = 0
+        self.drawn = 0
+        self.culled = 0
+
+    def despawn(self, group):
+        group.cull(self.bounds)
+
+    def draw(self, screen, groups, alpha=1.0):
+        """Desenha os grupos cortando o que está fora do ecrã; devolve os retângulos desenhados."""
+        rects = []
+        live = 0
+        for group in groups:
+            live += len(group)
+            rects.extend(group.draw(screen, alpha, self.view))
+        self.live = live
+        self.drawn = len(rects)
+        self.culled = live - self.drawn
+        return rects
+
+    def counts(self):
+        return {"vivas": self.live, "desenhadas": self.drawn, "cortadas": self.culled}
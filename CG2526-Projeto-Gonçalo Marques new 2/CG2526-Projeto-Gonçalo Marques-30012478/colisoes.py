@@ -0,0 +1,71 @@
+from configuracoes import *
+
+class SpatialHash:
+    """Grelha uniforme (broadphase) que limita os pares testados com colliderect.
+
+    Cada entidade é guardada com o seu índice na lista de origem, para que as
+    consultas devolvam as colisões pela mesma ordem que um ciclo sobre a lista.
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = []
+
+    def clear(self):
+        self.cells.clear()
+        self.items = []
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, (rect.right - 1) // cs,
+                rect.top // cs, (rect.bottom - 1) // cs)
+
+    def rebuild(self, entities, rects=None):
+        """Reconstrói a grelha com as posições atuais de entidades com .rect.
+
+        rects, se dado, são os retângulos das entidades já calculados (mesma ordem).
+        """
+        self.cells.clear()
+        self.items = list(entities)
+        if rects is None:
+            rects = [entity.rect for entity in self.items]
+        cells = self.cells
+        for index, rect in enumerate(rects):
+            x0, x1, y0, y1 = self._cell_range(rect)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [index]
+                    else:
+                        bucket.append(index)
+
+    def candidates(self, rect):
+        """Índices das entidades que partilham pelo menos uma célula com rect."""
+        found = set()
+        cells = self.cells
+        x0, x1, y0, y1 = self._cell_range(rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+    def collisions(self, rect, skip=()):
+        """Índices (por ordem da lista) das entidades que colidem com rect."""
+        items = self.items
+        return sorted(i for i in self.candidates(rect)
+                      if i not in skip and rect.colliderect(items[i].rect))
+
+    def first_collision(self, rect, skip=()):
+        """Índice da primeira entidade da lista que colide com rect, ou None."""
+        hits = self.collisions(rect, skip)
+        return hits[0] if hits else None
+
+def remove_indices(entities, indices):
+    """Devolve a lista sem as posições indicadas (remoção em lote, O(n))."""
+    if not indices:
+        return entities
+    return [e for i, e in enumerate(entities) if i not in indices]
@@ -7,7 +7,14 @@ pygame.init()
 
 # Obtém as dimensões do monitor atual para inicializar fullscreen
 info = pygame.display.Info()
-WIDTH, HEIGHT = info.current_w, info.current_h
+DISPLAY_WIDTH, DISPLAY_HEIGHT = info.current_w, info.current_h
+
+# Resolução lógica de desenho: posições, tamanhos e hitboxes usam estas unidades
+# e o ecrã é escalado uma vez para o monitor (flag SCALED), por isso o jogo é
+# igual em qualquer monitor. None = desenhar à resolução nativa do monitor.
+RENDER_SIZE = (1920, 1080)
+WIDTH, HEIGHT = RENDER_SIZE or (DISPLAY_WIDTH, DISPLAY_HEIGHT)
+DISPLAY_FLAGS = pygame.FULLSCREEN | pygame.SCALED if RENDER_SIZE else pygame.FULLSCREEN
 
 # Cores usadas no jogo (tuplas RGB)
 WHITE = (255, 255, 255)
@@ -18,16 +25,52 @@ RED_HOVER = (200, 30, 30)
 PRIMARY = (40, 120, 220)
 PRIMARY_HOVER = (30, 100, 200)
 
-# Frames por segundo alvo
+# Ticks de simulação por segundo (a lógica de jogo avança sempre a este ritmo)
 FPS = 60
 
+# Limite de frames desenhados por segundo e máximo de ticks simulados por frame
+RENDER_FPS_MAX = 144
+MAX_TICKS_PER_FRAME = 5
+
+# Modo de desenho do nível: "full" (ecrã inteiro por frame) ou "dirty" (só zonas alteradas).
+# No modo "dirty" o fundo e o chão ficam parados: com o fundo a deslizar todos os
+# píxeis mudariam em cada frame e o ecrã teria de ser enviado inteiro na mesma.
+RENDER_MODE = "full"
+# Ficheiro CSV com a área enviada ao ecrã em cada frame no modo "dirty" (None = sem relatório)
+DIRTY_REPORT_FILE = None
+
+# Governador de qualidade: baixa a qualidade visual por etapas (ver qualidade.py)
+# quando o percentil dos tempos de frame (ms) numa janela de frames excede o orçamento
+QUALITY_GOVERNOR = True
+QUALITY_FRAME_BUDGET_MS = 1000.0 / FPS
+QUALITY_PERCENTILE = 95
+QUALITY_WINDOW = 120
+QUALITY_HEADROOM = 0.6  # volta a subir abaixo desta fração do orçamento
+QUALITY_RENDER_SCALE = 0.5  # com a etapa "render_scale", escala interna do cenário
+QUALITY_COOLDOWN = 300  # frames sem subir depois de descer uma etapa
+QUALITY_BACKOFF_MAX = 8 # multiplicador máximo do cooldown quando a qualidade oscila
+
 # Diretórios de assets
 ASSET_DIR = "."
 IMAGES_DIR = os.path.join(ASSET_DIR, "Imagens_usadas")
 
+# Atlas de sprites pré-escalados gerado por "python atlas.py" (imagem + manifesto)
+ATLAS_IMAGE = os.path.join(IMAGES_DIR, "atlas.png")
+ATLAS_MANIFEST = os.path.join(IMAGES_DIR, "atlas.json")
+
+# Carregamento dos assets em segundo plano: threads de descodificação e tempo máximo (ms)
+# por frame do menu gasto a terminar assets no thread principal
+PRELOAD_WORKERS = 4
+PRELOAD_POLL_BUDGET_MS = 8
+
 # Ficheiro onde o highscore será guardado
 HIGHSCORE_FILE = "highscore.json"
 PROGRESS_FILE = "progress.json"  # NOVO: ficheiro de progresso
+GROUND_CACHE_FILE = "ground_cache.json"  # Cache da deteção do chão por (hash do background, resolução)
+HASH_CACHE_FILE = "hash_cache.json"  # Hash dos assets com data e tamanho (para não os reler)
+
+# Pasta onde cada nível jogado é gravado como replay (None = não grava; ver replay.py)
+REPLAY_DIR = None
 
 # Permite forçar uma posição do chão manualmente (None = detecção automática)
 MANUAL_GROUND_Y = 780
@@ -38,6 +81,17 @@ PLAYER_SIZE_SHOOT = (150, 150)
 FIREBALL_SIZE = (64, 64)
 BOSS_BULLET_SIZE = (98, 98)
 POWERUP_SIZE = (110, 110)
+BIRD_SIZE = (150, 100)
+BOSS_SIZE = (320, 240)
+
+# Orçamento (bytes) da cache de imagens carregadas por load_image
+IMAGE_CACHE_BUDGET = 64 * 1024 * 1024
+
+# Conversão das imagens conforme o uso real de alpha: opacas -> convert(), alpha binário
+# -> colorkey + RLEACCEL, restantes -> convert_alpha(). A tolerância é a fração de píxeis
+# semitransparentes que se aceita arredondar para colorkey (0 = só imagens exatamente binárias).
+IMAGE_ALPHA_TOLERANCE = 0.0
+IMAGE_COLORKEY = (255, 0, 255)
 
 # Ajustes da hitbox do Boss
 BOSS_HITBOX_INSET = (140, 120)
@@ -49,6 +103,25 @@ CACTUS_SCALE_MAX = 1.25
 CACTUS_MIN_WIDTH = 60
 CACTUS_MAX_WIDTH = 160
 CACTUS_MIN_HEIGHT = 60
+CACTUS_MAX_HEIGHT = min(int(PLAYER_SIZE_NORMAL[1] * 1.05), int(HEIGHT * 0.33))
+
+# Banco de troncos pré-desenhados: passo (px) entre tamanhos e nº máximo de superfícies
+TRONCO_SIZE_STEP = 10
+TRONCO_BANK_LIMIT = 160
+
+# Capacidade das pools de projéteis (tiros além disto são ignorados)
+PLAYER_BULLET_POOL_SIZE = 64
+BOSS_BULLET_POOL_SIZE = 128
+
+# Tamanho (px) das células da grelha de colisões
+COLLISION_CELL_SIZE = 128
+
+# Margem (px) à volta do ecrã: entidades que deixam de tocar nesta área são removidas
+DESPAWN_MARGIN = 200
+
+# Contentor das entidades dinâmicas: "objects" (um objeto por entidade) ou "numpy"
+# (arrays por tipo em entidades_vetor; sem NumPy instalado usa-se "objects")
+ENTITY_STORE = "objects"
 
 # Distâncias necessárias para completar cada nível (5 = boss level = infinito)
 LEVEL_DISTANCES = {
@@ -65,6 +138,19 @@ TITLE_FONT_MENU = pygame.font.SysFont("Comic Sans MS", 70, bold=True)
 BTN_FONT = pygame.font.SysFont("Arial", 32)
 HUD_FONT = pygame.font.SysFont("Arial", 30)
 
+# Profiler de frames (perfil.py; F3 durante o jogo): frames na janela dos percentis,
+# frames entre atualizações do painel e ficheiro CSV/JSONL com uma linha por frame
+PROFILE_WINDOW = 240
+PROFILE_OVERLAY_REFRESH = 15
+PROFILE_EXPORT_FILE = None
+PROFILE_FONT = ("Consolas", 20)  # nome e tamanho; a fonte só é criada ao abrir o painel
+
+# Tempo máximo (ms) que os menus ficam bloqueados à espera de eventos
+MENU_IDLE_TIMEOUT_MS = 500
+
+# Nº máximo de textos renderizados guardados na cache de texto
+TEXT_CACHE_SIZE = 256
+
 # Variáveis globais que serão atualizadas
 unlocked_levels = 1
 GROUND_Y = int(HEIGHT * 0.8)
@@ -1,14 +1,68 @@
 import pygame
 import random
 import math
+from collections import OrderedDict
+from itertools import islice
 from configuracoes import *
-from funcionalidades import load_image
+from funcionalidades import load_image, load_image_variant
+from colisoes import remove_indices
+
+# Imagens usadas pelas entidades (path, size, flip_x, flip_y[, effect]), carregadas antes do loop
+ENTITY_IMAGES = [
+    ("gato.png", PLAYER_SIZE_NORMAL, False, False),
+    ("gato_atirador.png", PLAYER_SIZE_SHOOT, False, False),
+    ("fireball.png", FIREBALL_SIZE, False, False),
+    ("egg.png", BOSS_BULLET_SIZE, False, False),
+    ("tronco_textura.png", None, False, False),
+    ("passaro.png", BIRD_SIZE, True, False),
+    ("power.png", POWERUP_SIZE, False, False),
+    ("Boss.png", BOSS_SIZE, True, False),
+    ("Boss.png", BOSS_SIZE, True, False, "hit_flash"),
+]
+
+def lerp_pos(entity, alpha):
+    """Posição de desenho interpolada entre o tick anterior (prev_pos) e o atual."""
+    px, py = entity.prev_pos
+    x, y = entity.rect.topleft
+    return (px + (x - px) * alpha, py + (y - py) * alpha)
+
+def visible(entity, view):
+    """True se o sprite pode aparecer em view entre a posição anterior e a atual."""
+    rect = entity.rect
+    px, py = entity.prev_pos
+    return view.colliderect(rect.union((px, py, rect.w, rect.h)))
+
+class SpriteStates:
+    """Superfícies de um sprite por pose e efeito visual, preparadas ao carregar.
+
+    poses: {nome: (path, size, flip_x, flip_y)}; effects: nomes de IMAGE_EFFECTS.
+    O draw só escolhe uma superfície já pronta com get(pose, effect).
+    """
+
+    __slots__ = ("surfaces",)
+
+    def __init__(self, poses, effects=()):
+        self.surfaces = {}
+        for pose, (path, size, flip_x, flip_y) in poses.items():
+            self.surfaces[pose, None] = load_image(path, size, flip_x=flip_x, flip_y=flip_y)
+            for effect in effects:
+                self.surfaces[pose, effect] = load_image_variant(path, size, flip_x, flip_y, effect)
+
+    def get(self, pose="normal", effect=None):
+        return self.surfaces[pose, effect]
 
 class Gato:
+    __slots__ = (
+        "sprites", "image", "shoot_timer", "JUMP_VEL", "rect",
+        "X_POS", "Y_POS", "is_jumping", "jump_vel", "y", "can_shoot", "shoot_timer_powerup", "prev_pos",
+    )
+
     def __init__(self):
-        self.image_normal = load_image("gato.png", PLAYER_SIZE_NORMAL)
-        self.image_shoot = load_image("gato_atirador.png", PLAYER_SIZE_SHOOT)
-        self.image = self.image_normal
+        self.sprites = SpriteStates({
+            "normal": ("gato.png", PLAYER_SIZE_NORMAL, False, False),
+            "shoot": ("gato_atirador.png", PLAYER_SIZE_SHOOT, False, False),
+        })
+        self.image = self.sprites.get("normal")
         self.shoot_timer = 0
         self.JUMP_VEL = 10
         
@@ -16,6 +70,7 @@ class Gato:
         self.X_POS = int(WIDTH * 0.08)
         self.Y_POS = GROUND_Y - self.rect.height
         self.rect.topleft = (self.X_POS, self.Y_POS)
+        self.prev_pos = self.rect.topleft
         
         self.is_jumping = False
         self.jump_vel = self.JUMP_VEL
@@ -37,7 +92,7 @@ class Gato:
         if self.shoot_timer > 0:
             self.shoot_timer -= 1
             if self.shoot_timer == 0:
-                self.image = self.image_normal
+                self.image = self.sprites.get("normal")
 
         if not self.is_jumping and (user_input[pygame.K_w] or user_input[pygame.K_SPACE]):
             self.is_jumping = True
@@ -64,31 +119,149 @@ class Gato:
             self.rect.x = WIDTH - self.rect.width
 
     def shoot(self):
-        self.image = self.image_shoot
+        self.image = self.sprites.get("shoot")
         self.shoot_timer = 8
 
-    def draw(self, screen):
-        screen.blit(self.image, (self.rect.x, self.rect.y))
+    def draw(self, screen, alpha=1.0):
+        return screen.blit(self.image, lerp_pos(self, alpha))
+
+class Pool:
+    """Pool de capacidade fixa: reaproveita objetos mortos e remove em O(1).
+
+    Os objetos vivos ocupam items[:count]; ao remover, o último vivo passa
+    para o lugar do removido (swap-remove), por isso a ordem não se mantém.
+    """
+
+    def __init__(self, cls, capacity):
+        self.items = [cls() for _ in range(capacity)]
+        for i, obj in enumerate(self.items):
+            obj.pool_index = i
+        self.count = 0
+
+    def spawn(self, *args, **kwargs):
+        """Ativa um objeto livre com reset(*args); devolve None se a pool estiver cheia."""
+        if self.count >= len(self.items):
+            return None
+        obj = self.items[self.count]
+        obj.reset(*args, **kwargs)
+        self.count += 1
+        return obj
+
+    def release(self, obj):
+        """Devolve obj à pool trocando-o com o último objeto vivo."""
+        i = obj.pool_index
+        last = self.count - 1
+        if i > last:
+            return
+        other = self.items[last]
+        self.items[i] = other
+        self.items[last] = obj
+        other.pool_index = i
+        obj.pool_index = last
+        self.count = last
+
+    def live(self):
+        """Lista dos objetos vivos (cópia, segura para remover durante o ciclo)."""
+        return self.items[:self.count]
+
+    def save_prev(self):
+        for obj in self:
+            obj.prev_pos = obj.rect.topleft
+
+    def move(self, *args):
+        """Chama update(*args) em todos os objetos vivos."""
+        for obj in self:
+            obj.update(*args)
+
+    def overlaps(self, rect):
+        """Índices (pela ordem de live()) dos objetos que colidem com rect."""
+        return rect.collidelistall(self.live())
+
+    def rects(self):
+        return [obj.rect for obj in self]
+
+    def draw(self, screen, alpha=1.0, view=None):
+        """Desenha os objetos vivos (só os visíveis em view, se dada) e devolve os retângulos."""
+        return [obj.draw(screen, alpha) for obj in self if view is None or visible(obj, view)]
+
+    def cull(self, bounds):
+        """Liberta os objetos que já não tocam em bounds."""
+        for obj in self.live():
+            if not bounds.colliderect(obj.rect):
+                self.release(obj)
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return islice(self.items, self.count)
+
+class EntityList(list):
+    """Lista de entidades-objeto com a interface das stores de entidades_vetor."""
+
+    def live(self):
+        return list(self)
+
+    def save_prev(self):
+        for entity in self:
+            entity.prev_pos = entity.rect.topleft
+
+    def move(self, *args):
+        for entity in self:
+            entity.update(*args)
+
+    def overlaps(self, rect):
+        return rect.collidelistall(self)
+
+    def rects(self):
+        return [entity.rect for entity in self]
+
+    def draw(self, screen, alpha=1.0, view=None):
+        return [e.draw(screen, alpha) for e in self if view is None or visible(e, view)]
+
+    def remove_indices(self, indices):
+        """Remove as posições indicadas mantendo a ordem das restantes."""
+        if indices:
+            self[:] = remove_indices(self, indices)
+
+    def cull(self, bounds):
+        self[:] = [e for e in self if bounds.colliderect(e.rect)]
 
 class Projetil:
+    __slots__ = ("image", "rect", "prev_pos", "pool_index")
     SPEED = 28
 
-    def __init__(self, x, y):
+    def __init__(self, x=0, y=0):
         self.image = load_image("fireball.png", FIREBALL_SIZE)
         self.rect = self.image.get_rect()
+        self.pool_index = -1
+        self.reset(x, y)
+
+    def reset(self, x, y):
         self.rect.midleft = (x, y)
+        self.prev_pos = self.rect.topleft
 
     def update(self):
         self.rect.x += self.SPEED
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def draw(self, screen, alpha=1.0):
+        return screen.blit(self.image, lerp_pos(self, alpha))
 
 class BossProjetil:
-    def __init__(self, x, y, vx=-13, vy=0):
+    __slots__ = ("image", "rect", "prev_pos", "vx", "vy", "pool_index")
+
+    def __init__(self, x=0, y=0, vx=-13, vy=0):
         self.image = load_image("egg.png", BOSS_BULLET_SIZE)
         self.rect = self.image.get_rect()
+        self.pool_index = -1
+        self.reset(x, y, vx, vy)
+
+    def reset(self, x, y, vx=-13, vy=0):
         self.rect.center = (x, y)
+        self.prev_pos = self.rect.topleft
         self.vx = vx
         self.vy = vy
 
@@ -96,21 +269,32 @@ class BossProjetil:
         self.rect.x += int(self.vx)
         self.rect.y += int(self.vy)
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def draw(self, screen, alpha=1.0):
+        return screen.blit(self.image, lerp_pos(self, alpha))
 
 # CORREÇÃO NO entidades.py
 
-class Tronco:
-    def __init__(self):
-        width = random.randint(CACTUS_MIN_WIDTH, CACTUS_MAX_WIDTH)
-        height = random.randint(CACTUS_MIN_HEIGHT, min(int(PLAYER_SIZE_NORMAL[1] * 1.05), int(HEIGHT * 0.33)))
-        
+def size_steps(min_size, max_size, step):
+    """Lista de tamanhos quantizados entre min_size e max_size (inclusive).
+
+    Os tamanhos ficam igualmente espaçados (passo real próximo de step), para
+    que cada variante cubra a mesma fatia do intervalo e a escolha uniforme
+    não favoreça nenhuma (ex.: 60-147 com step 10 dá 60, 70, 79, ..., 137, 147).
+    """
+    span = max_size - min_size
+    if span <= 0:
+        return [min_size]
+    n = -(-span // step)
+    return [min_size + round(i * span / n) for i in range(n + 1)]
+
+def render_tronco(width, height, tile_cache=None):
+    """Desenha a superfície de um tronco com a textura repetida na horizontal."""
+    surf = pygame.Surface((width, height), pygame.SRCALPHA)
+
+    tile_img = tile_cache.get(height) if tile_cache is not None else None
+    if tile_img is None:
         base_img = load_image("tronco_textura.png")
         base_w, base_h = base_img.get_size()
-        
-        surf = pygame.Surface((width, height), pygame.SRCALPHA)
-        
         if base_h > 0:
             scale = height / base_h
         else:
@@ -118,30 +302,83 @@ class Tronco:
         tile_w = max(1, int(base_w * scale))
         tile_h = max(1, int(base_h * scale))
         tile_img = pygame.transform.scale(base_img, (tile_w, tile_h))
-        
-        x = 0
-        while x < width:
-            surf.blit(tile_img, (x, 0))
-            x += tile_w
-        
-        pygame.draw.rect(surf, (80, 50, 25), surf.get_rect(), 3)
-        pygame.draw.rect(surf, (0, 0, 0, 40), (0, height - 6, width, 6))
-        
-        self.surf = surf
+        if tile_cache is not None:
+            tile_cache[height] = tile_img
+
+    tile_w = tile_img.get_width()
+    x = 0
+    while x < width:
+        surf.blit(tile_img, (x, 0))
+        x += tile_w
+
+    pygame.draw.rect(surf, (80, 50, 25), surf.get_rect(), 3)
+    pygame.draw.rect(surf, (0, 0, 0, 40), (0, height - 6, width, 6))
+    return surf
+
+class TroncoBank:
+    """Banco de superfícies de troncos pré-desenhadas para tamanhos quantizados."""
+
+    def __init__(self, step=TRONCO_SIZE_STEP, limit=TRONCO_BANK_LIMIT):
+        self.widths = size_steps(CACTUS_MIN_WIDTH, CACTUS_MAX_WIDTH, step)
+        self.heights = size_steps(CACTUS_MIN_HEIGHT, max(CACTUS_MIN_HEIGHT, CACTUS_MAX_HEIGHT), step)
+        self.limit = limit
+        self.surfaces = OrderedDict()
+        self.tiles = {}
+
+    def random_size(self, rng=random):
+        """Escolhe um tamanho uniformemente entre as variantes (igualmente espaçadas, ver size_steps)."""
+        return rng.choice(self.widths), rng.choice(self.heights)
+
+    def get(self, width, height):
+        key = (width, height)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            return surf
+
+        surf = render_tronco(width, height, self.tiles)
+        self.surfaces[key] = surf
+        while len(self.surfaces) > self.limit:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def prebuild(self):
+        """Desenha todas as variantes de uma vez (chamado no início do nível)."""
+        for w in self.widths:
+            for h in self.heights:
+                self.get(w, h)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.tiles.clear()
+
+# Banco partilhado por todos os troncos
+TRONCO_BANK = TroncoBank()
+
+class Tronco:
+    __slots__ = ("surf", "rect", "prev_pos")
+
+    def __init__(self, rng=random):
+        width, height = TRONCO_BANK.random_size(rng)
+
+        self.surf = TRONCO_BANK.get(width, height)
         self.rect = self.surf.get_rect()
         # CORREÇÃO: Alinha corretamente com o chão
         self.rect.bottom = GROUND_Y  # Mudei de topleft para bottom
         self.rect.left = WIDTH + 50
+        self.prev_pos = self.rect.topleft
 
-    def update(self, speed):
+    def update(self, speed, now_ms=None):
         self.rect.x -= speed
 
-    def draw(self, screen):
-        screen.blit(self.surf, (self.rect.x, self.rect.y))
+    def draw(self, screen, alpha=1.0):
+        return screen.blit(self.surf, lerp_pos(self, alpha))
 
 class Bird:
-    def __init__(self):
-        self.image = load_image("passaro.png", (150, 100), flip_x=True)
+    __slots__ = ("image", "rect", "prev_pos", "wave_offset")
+
+    def __init__(self, rng=random, visual_rng=None):
+        self.image = load_image("passaro.png", BIRD_SIZE, flip_x=True)
         self.rect = self.image.get_rect()
         
         # CORREÇÃO: Pássaros mais altos
@@ -149,44 +386,61 @@ class Bird:
         alt1 = base_height
         alt2 = base_height - 80  # Aumentei de 60 para 80
         alt3 = base_height - 160  # Nova altura mais alta
-        height = random.choice([alt1, alt2, alt3])
+        height = rng.choice([alt1, alt2, alt3])
         
         self.rect.topleft = (WIDTH + 50, height)
-        self.wave_offset = random.uniform(0, math.pi * 2)
+        self.prev_pos = self.rect.topleft
+        self.wave_offset = (visual_rng or rng).uniform(0, math.pi * 2)
 
-    def update(self, speed):
+    def update(self, speed, now_ms=None):
+        if now_ms is None:
+            now_ms = pygame.time.get_ticks()
         self.rect.x -= speed
-        self.rect.y += int(math.sin(pygame.time.get_ticks() * 0.005 + self.wave_offset) * 2.0)
+        self.rect.y += int(math.sin(now_ms * 0.005 + self.wave_offset) * 2.0)
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def draw(self, screen, alpha=1.0):
+        return screen.blit(self.image, lerp_pos(self, alpha))
 
 class PowerUp:
+    __slots__ = ("image", "rect", "prev_pos", "base_x", "base_y")
+
     def __init__(self):
         self.image = load_image("power.png", POWERUP_SIZE)
         self.rect = self.image.get_rect()
         self.base_x = WIDTH + 80
         self.base_y = GROUND_Y - 140
         self.rect.center = (self.base_x, self.base_y)
+        self.prev_pos = self.rect.topleft
 
-    def update(self, speed):
+    def update(self, speed, now_ms=None):
+        if now_ms is None:
+            now_ms = pygame.time.get_ticks()
         self.base_x -= speed
-        t = pygame.time.get_ticks() / 400.0
+        t = now_ms / 400.0
         float_offset = math.sin(t) * 12
         self.rect.centerx = int(self.base_x)
         self.rect.centery = int(self.base_y + float_offset)
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def draw(self, screen, alpha=1.0):
+        return screen.blit(self.image, lerp_pos(self, alpha))
 
 class Boss:
-    def __init__(self):
-        self.image_base = load_image("Boss.png", (320, 240), flip_x=True)
+    __slots__ = (
+        "sprites", "image_base", "rect", "start_x", "start_y", "hp", "max_hp", "base_speed_x", "speed_x",
+        "state", "state_timer", "smash_phase", "smash_speed_down", "smash_wait_timer",
+        "dash_direction", "dash_speed", "shoot_cooldown", "shoot_burst", "hit_timer", "prev_pos",
+        "rng",
+    )
+
+    def __init__(self, rng=random):
+        self.sprites = SpriteStates({"normal": ("Boss.png", BOSS_SIZE, True, False)}, effects=("hit_flash",))
+        self.image_base = self.sprites.get("normal")
         self.rect = self.image_base.get_rect()
         
         self.start_x = WIDTH - 360
         self.start_y = int(HEIGHT * 0.28)
         self.rect.topleft = (self.start_x, self.start_y)
+        self.prev_pos = self.rect.topleft
         
         self.hp = 170
         self.max_hp = 170
@@ -198,12 +452,14 @@ class Boss:
         
         self.smash_phase = "up"
         self.smash_speed_down = 12
+        self.smash_wait_timer = 0
         self.dash_direction = -1
         self.dash_speed = 26
         self.shoot_cooldown = 120
         self.shoot_burst = 0
         
         self.hit_timer = 0
+        self.rng = rng
 
     def get_collision_rect(self):
         cr = self.rect.inflate(-BOSS_HITBOX_INSET[0], -BOSS_HITBOX_INSET[1])
@@ -241,8 +497,8 @@ class Boss:
             self.rect.y = bottom_limit
 
     def choose_next_state(self):
-        self.state_timer = random.randint(160, 240)
-        choice = random.random()
+        self.state_timer = self.rng.randint(160, 240)
+        choice = self.rng.random()
         if choice < 0.35:
             self.state = "smash"
             self.smash_phase = "up"
@@ -314,7 +570,7 @@ class Boss:
         if dist < 8:
             self.rect.topleft = (self.start_x, self.start_y)
             self.state = "normal"
-            self.state_timer = random.randint(160, 240)
+            self.state_timer = self.rng.randint(160, 240)
             self.speed_x = self.base_speed_x
             return
         step = 12
@@ -341,10 +597,10 @@ class Boss:
                 self.shoot_burst -= 1
                 return True
         elif self.state == "normal":
-            if random.randint(0, 420) == 0:
+            if self.rng.randint(0, 420) == 0:
                 return True
         elif self.state == "dash":
-            if random.randint(0, 600) == 0:
+            if self.rng.randint(0, 600) == 0:
                 return True
         return False
 
@@ -354,10 +610,8 @@ class Boss:
         if from_state in ("smash", "dash"):
             self.state = "recoil"
 
-    def draw(self, screen):
-        if self.hit_timer > 0:
-            flash = self.image_base.copy()
-            flash.fill((255, 255, 255, 120), None, pygame.BLEND_RGBA_ADD)
-            screen.blit(flash, self.rect)
-        else:
-            screen.blit(self.image_base, self.rect)
+    def draw(self, screen, alpha=1.0, flash=True):
+        pos = lerp_pos(self, alpha)
+        # Variante de flash pré-calculada ao carregar (sem cópias por frame)
+        effect = "hit_flash" if flash and self.hit_timer > 0 else None
+        return screen.blit(self.sprites.get("normal", effect), pos)
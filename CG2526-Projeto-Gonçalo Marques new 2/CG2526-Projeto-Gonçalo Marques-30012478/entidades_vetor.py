@@ -0,0 +1,280 @@
+import math
+from itertools import islice
+import pygame
+from entidades import lerp_pos
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele o Nivel usa as listas de objetos
+    np = None
+
+VECTOR_STORE_AVAILABLE = np is not None
+
+class EntityProxy:
+    """Vista leve de uma linha de uma store: rect e prev_pos lidos dos arrays.
+
+    Serve para desenhar e para as colisões que continuam a ser feitas objeto
+    a objeto (tiros contra ovos e obstáculos); não tem update().
+    """
+
+    __slots__ = ("store", "index", "image")
+
+    def __init__(self, store, index, image):
+        self.store = store
+        self.index = index
+        self.image = image
+
+    @property
+    def rect(self):
+        s, i = self.store, self.index
+        return pygame.Rect(int(s.x[i]), int(s.y[i]), int(s.w[i]), int(s.h[i]))
+
+    @property
+    def prev_pos(self):
+        s, i = self.store, self.index
+        return (int(s.px[i]), int(s.py[i]))
+
+    def draw(self, screen, alpha=1.0):
+        return screen.blit(self.image, lerp_pos(self, alpha))
+
+class VectorStore:
+    """Entidades de um tipo em arrays NumPy, um array por campo (struct-of-arrays).
+
+    A linha i corresponde a proxies[i] e as vivas ocupam [:count]. Movimento,
+    cull e colisões com um retângulo são operações vetoriais sobre as colunas.
+    Tem a mesma interface que EntityList e Pool (entidades.py).
+    """
+
+    INT_FIELDS = ("x", "y", "px", "py", "w", "h")
+    FLOAT_FIELDS = ()
+
+    def __init__(self, capacity=32):
+        self.fields = self.INT_FIELDS + self.FLOAT_FIELDS
+        self.proxies = []
+        self.count = 0
+        self.capacity = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name in self.fields:
+            dtype = np.float64 if name in self.FLOAT_FIELDS else np.int64
+            column = np.zeros(capacity, dtype)
+            if self.capacity:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def _image(self, entity):
+        return entity.image
+
+    def _init_row(self, i, entity):
+        """Preenche os campos próprios do tipo a partir da entidade-objeto."""
+
+    def append(self, entity):
+        """Copia uma entidade-objeto (Tronco, Bird, ...) para uma nova linha; devolve o proxy."""
+        i = self.count
+        if i >= self.capacity:
+            self._grow(self.capacity * 2)
+        self.x[i], self.y[i], self.w[i], self.h[i] = entity.rect
+        self.px[i], self.py[i] = entity.prev_pos
+        self._init_row(i, entity)
+        image = self._image(entity)
+        if i < len(self.proxies):
+            proxy = self.proxies[i]
+            proxy.image = image
+        else:
+            proxy = EntityProxy(self, i, image)
+            self.proxies.append(proxy)
+        self.count = i + 1
+        return proxy
+
+    def release(self, proxy):
+        """Remove em O(1) passando a última linha viva para o lugar da removida (como Pool)."""
+        i = proxy.index
+        last = self.count - 1
+        if i > last:
+            return
+        if i != last:
+            for name in self.fields:
+                column = getattr(self, name)
+                column[i] = column[last]
+            other = self.proxies[last]
+            self.proxies[i] = other
+            self.proxies[last] = proxy
+            other.index = i
+            proxy.index = last
+        self.count = last
+
+    def retain(self, keep):
+        """Mantém só as linhas vivas com keep[i] True, pela mesma ordem."""
+        n = self.count
+        kept = np.flatnonzero(keep)
+        if len(kept) == n:
+            return
+        for name in self.fields:
+            column = getattr(self, name)
+            column[:len(kept)] = column[kept]
+        proxies = self.proxies
+        alive = [proxies[i] for i in kept]
+        dead = [p for p, k in zip(proxies[:n], keep) if not k]
+        proxies[:n] = alive + dead
+        for index, proxy in enumerate(proxies[:n]):
+            proxy.index = index
+        self.count = len(kept)
+
+    def _drop(self, drop):
+        self.retain(~drop)
+
+    def remove_indices(self, indices):
+        if indices:
+            keep = np.ones(self.count, bool)
+            keep[list(indices)] = False
+            self.retain(keep)
+
+    def _overlap_mask(self, rect):
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        return ((x < rect.right) & (x + self.w[:n] > rect.x)
+                & (y < rect.bottom) & (y + self.h[:n] > rect.y))
+
+    def _visible_mask(self, view):
+        # Retângulo que cobre a posição anterior e a atual (onde a interpolação desenha)
+        n = self.count
+        x, y, px, py = self.x[:n], self.y[:n], self.px[:n], self.py[:n]
+        return ((np.minimum(x, px) < view.right) & (np.maximum(x, px) + self.w[:n] > view.x)
+                & (np.minimum(y, py) < view.bottom) & (np.maximum(y, py) + self.h[:n] > view.y))
+
+    def cull(self, bounds):
+        """Remove as linhas que já não tocam em bounds."""
+        if self.count:
+            drop = ~self._overlap_mask(bounds)
+            if drop.any():
+                self._drop(drop)
+
+    def overlaps(self, rect):
+        """Índices das linhas vivas que colidem com rect (teste AABB de todas de uma vez)."""
+        if not self.count:
+            return []
+        return np.flatnonzero(self._overlap_mask(rect)).tolist()
+
+    def rects(self):
+        """Retângulos das linhas vivas, construídos de uma vez a partir das colunas."""
+        n = self.count
+        rows = np.column_stack((self.x[:n], self.y[:n], self.w[:n], self.h[:n])).tolist()
+        return list(map(pygame.Rect, rows))
+
+    def draw(self, screen, alpha=1.0, view=None):
+        """Desenha as linhas vivas (só as visíveis em view, se dada) com um único blits."""
+        n = self.count
+        if not n:
+            return []
+        rows = np.arange(n) if view is None else np.flatnonzero(self._visible_mask(view))
+        if not len(rows):
+            return []
+        px, py = self.px[rows], self.py[rows]
+        xs = (px + (self.x[rows] - px) * alpha).tolist()
+        ys = (py + (self.y[rows] - py) * alpha).tolist()
+        proxies = self.proxies
+        images = [proxies[i].image for i in rows.tolist()]
+        return screen.blits(zip(images, zip(xs, ys)))
+
+    def save_prev(self):
+        n = self.count
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+
+    def live(self):
+        return self.proxies[:self.count]
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return islice(self.proxies, self.count)
+
+class ObstacleStore(VectorStore):
+    """Troncos e pássaros; os pássaros (bob = 1) oscilam na vertical como Bird.update."""
+
+    INT_FIELDS = VectorStore.INT_FIELDS + ("bob",)
+    FLOAT_FIELDS = ("phase",)
+
+    def _image(self, entity):
+        # Tronco guarda a superfície em surf, Bird em image
+        return entity.surf if hasattr(entity, "surf") else entity.image
+
+    def _init_row(self, i, entity):
+        offset = getattr(entity, "wave_offset", None)
+        self.bob[i] = offset is not None
+        self.phase[i] = offset or 0.0
+
+    def move(self, speed, now_ms=None):
+        n = self.count
+        if not n:
+            return
+        if now_ms is None:
+            now_ms = pygame.time.get_ticks()
+        self.x[:n] -= speed
+        birds = np.flatnonzero(self.bob[:n])
+        if len(birds):
+            # int() do Bird trunca em direção a zero, tal como np.trunc
+            bob = np.trunc(np.sin(now_ms * 0.005 + self.phase[birds]) * 2.0)
+            self.y[birds] += bob.astype(np.int64)
+
+class PowerUpStore(VectorStore):
+    """Powerups: avançam em base_x e flutuam à volta de base_y como PowerUp.update."""
+
+    FLOAT_FIELDS = ("base_x", "base_y")
+
+    def _init_row(self, i, entity):
+        self.base_x[i] = entity.base_x
+        self.base_y[i] = entity.base_y
+
+    def move(self, speed, now_ms=None):
+        n = self.count
+        if not n:
+            return
+        if now_ms is None:
+            now_ms = pygame.time.get_ticks()
+        self.base_x[:n] -= speed
+        float_offset = math.sin(now_ms / 400.0) * 12
+        # rect.center = (cx, cy) equivale a x = cx - w // 2, y = cy - h // 2
+        self.x[:n] = self.base_x[:n].astype(np.int64) - self.w[:n] // 2
+        self.y[:n] = (self.base_y[:n] + float_offset).astype(np.int64) - self.h[:n] // 2
+
+class ProjectileStore(VectorStore):
+    """Substituto vetorial de Pool(cls, capacity) para Projetil e BossProjetil.
+
+    spawn() prepara um objeto modelo com cls.reset e copia-o para uma linha;
+    a velocidade inteira (int(vx), int(vy)) fica guardada para move().
+    """
+
+    INT_FIELDS = VectorStore.INT_FIELDS + ("vx", "vy")
+
+    def __init__(self, cls, capacity):
+        self.template = cls()
+        super().__init__(capacity)
+
+    def spawn(self, *args, **kwargs):
+        """Ativa uma linha com cls.reset(*args); devolve None se a store estiver cheia."""
+        if self.count >= self.capacity:
+            return None
+        self.template.reset(*args, **kwargs)
+        return self.append(self.template)
+
+    def _init_row(self, i, entity):
+        vx = getattr(entity, "vx", None)
+        self.vx[i] = entity.SPEED if vx is None else int(vx)
+        self.vy[i] = int(getattr(entity, "vy", 0))
+
+    def _drop(self, drop):
+        # Remoção pela mesma ordem que Pool.cull, para os índices coincidirem
+        for proxy in [self.proxies[i] for i in np.flatnonzero(drop)]:
+            self.release(proxy)
+
+    def move(self):
+        n = self.count
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
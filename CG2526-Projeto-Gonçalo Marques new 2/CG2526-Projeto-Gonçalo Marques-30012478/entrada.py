@@ -0,0 +1,133 @@
+import pygame
+
+# Nomes das teclas usadas pelo jogo (para guiões e gravações)
+KEY_NAMES = {
+    "w": pygame.K_w,
+    "space": pygame.K_SPACE,
+    "a": pygame.K_a,
+    "d": pygame.K_d,
+    "x": pygame.K_x,
+    "p": pygame.K_p,
+}
+
+class InputFrame:
+    """Estado das teclas num tick; indexável como pygame.key.get_pressed()."""
+
+    __slots__ = ("held",)
+
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class ScriptedInput:
+    """Fonte de input que segue um guião em vez do teclado.
+
+    Cada passo é (tecla, início, fim, período): a tecla fica premida nos
+    ticks [início, fim) e, se período > 0, o padrão repete-se a cada período
+    ticks. As teclas "x" e "p" geram um toque (KEYDOWN) no tick de início.
+    """
+
+    TAP_KEYS = (pygame.K_x, pygame.K_p)
+
+    def __init__(self, steps=()):
+        self.steps = [(KEY_NAMES.get(k, k), start, end, period) for k, start, end, period in steps]
+
+    @classmethod
+    def parse(cls, text):
+        """Lê um guião no formato "tecla@início[-fim][/período],..." (ex.: "w@0-8/45,x@0/10")."""
+        steps = []
+        for item in filter(None, (part.strip() for part in text.split(","))):
+            key, _, when = item.partition("@")
+            when, _, period = when.partition("/")
+            start, _, end = when.partition("-")
+            start = int(start or 0)
+            end = int(end) if end else start + 1
+            if key not in KEY_NAMES:
+                raise ValueError(f"Tecla desconhecida no guião: {key!r}")
+            steps.append((key, start, end, int(period or 0)))
+        return cls(steps)
+
+    def _active(self, tick, start, end, period):
+        if tick < start:
+            return False
+        t = (tick - start) % period if period > 0 else tick - start
+        return t < end - start
+
+    def poll(self, tick):
+        """Devolve (InputFrame, teclas tocadas neste tick)."""
+        held = []
+        taps = []
+        for key, start, end, period in self.steps:
+            if key in self.TAP_KEYS:
+                if self._active(tick, start, start + 1, period):
+                    taps.append(key)
+            elif self._active(tick, start, end, period):
+                held.append(key)
+        return InputFrame(held), taps
+
+# Bits usados para gravar o input de cada tick (X = disparo neste tick;
+# P marca o tick em que o jogo foi retomado após uma pausa, é só informativo)
+INPUT_BITS = (
+    (pygame.K_w, 0x01),
+    (pygame.K_SPACE, 0x02),
+    (pygame.K_a, 0x04),
+    (pygame.K_d, 0x08),
+    (pygame.K_x, 0x10),
+    (pygame.K_p, 0x20),
+)
+HELD_BITS = tuple((key, bit) for key, bit in INPUT_BITS if key not in ScriptedInput.TAP_KEYS)
+TAP_BITS = tuple((key, bit) for key, bit in INPUT_BITS if key in ScriptedInput.TAP_KEYS)
+
+def input_to_mask(user_input, taps=()):
+    """Converte o input de um tick (teclas premidas + toques) numa máscara de bits."""
+    mask = 0
+    for key, bit in HELD_BITS:
+        if user_input[key]:
+            mask |= bit
+    for key, bit in TAP_BITS:
+        if key in taps:
+            mask |= bit
+    return mask
+
+def mask_to_input(mask):
+    """Inverso de input_to_mask: devolve (InputFrame, toques)."""
+    held = [key for key, bit in HELD_BITS if mask & bit]
+    taps = [key for key, bit in TAP_BITS if mask & bit]
+    return InputFrame(held), taps
+
+class InputRecorder:
+    """Grava a máscara de input de cada tick em runs (máscara, repetições)."""
+
+    def __init__(self):
+        self.runs = []
+        self.ticks = 0
+
+    def record(self, mask):
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.ticks += 1
+
+class ReplayInput:
+    """Fonte de input que reproduz runs gravadas por InputRecorder, tick a tick."""
+
+    def __init__(self, runs):
+        self.runs = runs
+        self.run_index = 0
+        self.run_left = runs[0][1] if runs else 0
+        self.next_tick = 0
+
+    def poll(self, tick):
+        if tick != self.next_tick:
+            raise ValueError("ReplayInput tem de ser lido em ticks consecutivos")
+        self.next_tick += 1
+        while self.run_left == 0 and self.run_index + 1 < len(self.runs):
+            self.run_index += 1
+            self.run_left = self.runs[self.run_index][1]
+        if self.run_left == 0:
+            return InputFrame(), []
+        self.run_left -= 1
+        return mask_to_input(self.runs[self.run_index][0])
@@ -1,20 +1,273 @@
 import pygame
 import json
+import io
 import os
 import math
+import hashlib
+from collections import OrderedDict
 from configuracoes import *
 
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele usa-se o caminho em Python puro
+    np = None
+
+class ImageCache:
+    """Cache LRU das imagens já carregadas, limitada por um orçamento em bytes."""
+
+    def __init__(self, budget_bytes=IMAGE_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def surface_bytes(surf):
+        w, h = surf.get_size()
+        return w * h * surf.get_bytesize()
+
+    def get(self, key):
+        surf = self.entries.get(key)
+        if surf is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return surf
+
+    def put(self, key, surf):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= self.surface_bytes(old)
+        self.entries[key] = surf
+        self.bytes_used += self.surface_bytes(surf)
+
+        # Remove as entradas menos usadas até caber no orçamento (mantém sempre a última)
+        while self.bytes_used > self.budget_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes_used -= self.surface_bytes(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+# Cache partilhada por todo o processo
+IMAGE_CACHE = ImageCache()
+
+# Caminho de conversão usado por cada imagem carregada: chave da cache -> "opaque"/"colorkey"/"alpha"
+IMAGE_LOAD_REPORT = {}
+
+def classify_alpha(surf, tolerance=IMAGE_ALPHA_TOLERANCE):
+    """Classifica uma superfície com alpha por píxel: "opaque", "colorkey" ou "alpha"."""
+    w, h = surf.get_size()
+    solid = pygame.mask.from_surface(surf, 254).count()
+    if solid == w * h:
+        return "opaque"
+    visible = pygame.mask.from_surface(surf, 0).count()
+    if visible - solid <= tolerance * visible:
+        return "colorkey"
+    return "alpha"
+
+def optimize_surface(surf, tolerance=IMAGE_ALPHA_TOLERANCE, colorkey=IMAGE_COLORKEY, mode=None):
+    """Converte surf para o formato de blit mais rápido; devolve (superfície, caminho).
+
+    mode, se dado, é o resultado de classify_alpha já calculado noutra thread.
+    """
+    if mode is None:
+        mode = classify_alpha(surf, tolerance)
+    if mode == "opaque":
+        return surf.convert(), mode
+    if mode == "colorkey":
+        # Cores sem alpha e máscara dos píxeis que ficam visíveis
+        solid = surf.convert()
+        visible = pygame.mask.from_surface(surf, 127)
+        # A cor chave não pode aparecer na imagem; se aparecer fica com alpha
+        key_pixels = pygame.mask.from_threshold(solid, colorkey, (1, 1, 1, 255))
+        if not visible.overlap_area(key_pixels, (0, 0)):
+            keyed = pygame.Surface(surf.get_size()).convert()
+            visible.to_surface(keyed, setsurface=solid, unsetcolor=colorkey)
+            keyed.set_colorkey(colorkey, pygame.RLEACCEL)
+            return keyed, mode
+    return surf, "alpha"
+
+def image_load_report():
+    """Lista (path, size, flip_x, flip_y, caminho) de cada imagem carregada do disco."""
+    return [key[:4] + (mode,) for key, mode in IMAGE_LOAD_REPORT.items()]
+
+def image_key(path, size=None, flip_x=False, flip_y=False, effect=None):
+    """Chave usada na cache de imagens para uma variante de um asset."""
+    key = (path, tuple(size) if size else None, bool(flip_x), bool(flip_y))
+    return key + (effect,) if effect else key
+
+def _effect_hit_flash(surf):
+    # Cópia com alpha por píxel: numa imagem com colorkey a soma estragaria a cor chave
+    flash = surf.convert_alpha()
+    flash.fill((255, 255, 255, 120), None, pygame.BLEND_RGBA_ADD)
+    return flash
+
+# Efeitos visuais pré-calculados por load_image_variant: nome -> função(superfície) -> nova superfície
+IMAGE_EFFECTS = {
+    "hit_flash": _effect_hit_flash,
+}
+
 def load_image(path, size=None, dirs=(ASSET_DIR, IMAGES_DIR), flip_x=False, flip_y=False, fallback_color=(150,150,150)):
-    """Carrega uma imagem procurando nas pastas especificadas."""
+    """Carrega uma imagem procurando nas pastas especificadas.
+
+    O resultado fica na IMAGE_CACHE; a superfície devolvida é partilhada e não deve ser alterada.
+    """
+    key = image_key(path, size, flip_x, flip_y)
+    cached = IMAGE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    atlas = sprite_atlas()
+    img = atlas.get(key) if atlas else None
+    if img is not None:
+        img, mode = optimize_surface(img)
+        IMAGE_LOAD_REPORT[key] = "atlas:" + mode
+    else:
+        img = _load_image_from_disk(path, size, dirs, flip_x, flip_y, fallback_color)
+        img, IMAGE_LOAD_REPORT[key] = optimize_surface(img)
+    IMAGE_CACHE.put(key, img)
+    return img
+
+def load_image_variant(path, size=None, flip_x=False, flip_y=False, effect=None):
+    """Como load_image, mas com um efeito de IMAGE_EFFECTS aplicado uma única vez.
+
+    A variante fica na IMAGE_CACHE ao lado da imagem base, por isso desenhá-la
+    não custa mais do que desenhar o sprite normal.
+    """
+    base = load_image(path, size, flip_x=flip_x, flip_y=flip_y)
+    if effect is None:
+        return base
+    key = image_key(path, size, flip_x, flip_y, effect)
+    cached = IMAGE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    img = IMAGE_EFFECTS[effect](base)
+    IMAGE_CACHE.put(key, img)
+    return img
+
+class SpriteAtlas:
+    """Atlas de sprites já escalados e espelhados, gerado offline por atlas.py.
+
+    get(key) devolve uma subsurface do atlas (sem descodificar nem escalar o PNG original).
+    """
+
+    def __init__(self, surface, rects):
+        self.surface = surface
+        self.rects = rects
+
+    def get(self, key):
+        rect = self.rects.get(key)
+        return self.surface.subsurface(rect) if rect else None
+
+    @classmethod
+    def from_manifest(cls, manifest, surface):
+        rects = {}
+        for s in manifest["sprites"]:
+            key = image_key(s["path"], s["size"], s["flip_x"], s["flip_y"])
+            rects[key] = pygame.Rect(s["rect"])
+        return cls(surface, rects)
+
+    @classmethod
+    def load(cls, manifest_path=ATLAS_MANIFEST, image_path=ATLAS_IMAGE):
+        """Carrega o atlas; devolve None se não existir ou se algum PNG de origem mudou."""
+        manifest = read_atlas_manifest(manifest_path)
+        FILE_HASHES.save()
+        if manifest is None:
+            return None
+        try:
+            surface = pygame.image.load(image_path).convert_alpha()
+        except Exception:
+            return None
+        return cls.from_manifest(manifest, surface)
+
+def read_atlas_manifest(manifest_path=ATLAS_MANIFEST):
+    """Lê o manifesto do atlas; None se não existir ou se algum PNG de origem mudou.
+
+    Os hashes vêm de FILE_HASHES (só lê os PNG cuja data ou tamanho mudou); não
+    escreve nada, por isso pode correr numa thread de carregamento.
+    """
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        for path, digest in manifest["sources"].items():
+            full = find_asset_path(path)
+            if full is None or FILE_HASHES.hash(full) != digest:
+                return None
+        return manifest
+    except Exception:
+        return None
+
+_ATLAS = []
+
+def sprite_atlas():
+    """Atlas partilhado, carregado na primeira utilização (None se não houver atlas válido)."""
+    if not _ATLAS:
+        _ATLAS.append(SpriteAtlas.load())
+    return _ATLAS[0]
+
+def set_sprite_atlas(atlas):
+    """Define o atlas partilhado (usado pelo carregamento em segundo plano)."""
+    _ATLAS[:] = [atlas]
+
+def decode_image(full_path):
+    """Lê e descodifica um ficheiro de imagem sem o converter para o formato do ecrã.
+
+    Não toca no ecrã, por isso pode correr numa thread de carregamento.
+    """
+    with open(full_path, "rb") as f:
+        data = f.read()
+    return pygame.image.load(io.BytesIO(data), os.path.basename(full_path))
+
+def _prepare_image(img, size, flip_x, flip_y):
+    if size:
+        img = pygame.transform.scale(img, size)
+    if flip_x or flip_y:
+        img = pygame.transform.flip(img, flip_x, flip_y)
+    return img
+
+def prepare_image(full_path, key):
+    """Descodifica, escala e classifica o alpha de uma imagem; devolve (superfície, modo).
+
+    Não toca no ecrã, por isso pode correr numa thread de carregamento.
+    """
+    path, size, flip_x, flip_y = key[:4]
+    img = _prepare_image(decode_image(full_path), size, flip_x, flip_y)
+    return img, classify_alpha(img)
+
+def finish_image(key, prepared):
+    """Passo final de uma imagem preparada noutra thread (prepare_image): conversão e cache.
+
+    Tem de correr no thread principal (convert usa o formato do ecrã).
+    """
+    img, mode = prepared
+    if mode != "opaque":
+        img = img.convert_alpha()
+    img, IMAGE_LOAD_REPORT[key] = optimize_surface(img, mode=mode)
+    IMAGE_CACHE.put(key, img)
+    return img
+
+def _load_image_from_disk(path, size, dirs, flip_x, flip_y, fallback_color):
     for d in dirs:
         try:
             full = os.path.join(d, path)
             img = pygame.image.load(full).convert_alpha()
-            if size:
-                img = pygame.transform.scale(img, size)
-            if flip_x or flip_y:
-                img = pygame.transform.flip(img, flip_x, flip_y)
-            return img
+            return _prepare_image(img, size, flip_x, flip_y)
         except Exception:
             continue
 
@@ -25,66 +278,140 @@ def load_image(path, size=None, dirs=(ASSET_DIR, IMAGES_DIR), flip_x=False, flip
     pygame.draw.rect(surf, (0, 0, 0), surf.get_rect(), 2)
     return surf
 
+def preload_images(specs):
+    """Carrega antecipadamente uma lista de (path, size, flip_x, flip_y[, effect]) para a cache."""
+    for spec in specs:
+        path, size, flip_x, flip_y, effect = (tuple(spec) + (None, False, False, None))[:5]
+        load_image_variant(path, size, flip_x, flip_y, effect)
+
+def _ground_row_match(green_count, diff_count, samples):
+    """Aplica os limiares de uma linha; devolve o ajuste de y ou None."""
+    green_frac = green_count / samples
+    diff_frac = diff_count / samples
+    if green_frac > 0.18 and diff_frac > 0.25:
+        return 2
+    if diff_frac > 0.35:
+        return 4
+    return None
+
 def detect_ground_y_from_bg(surface):
     """Tenta detectar automaticamente a linha do chão no background."""
     try:
         w, h = surface.get_size()
         sample_y = max(2, min(20, h // 20))
-        sky_sample = surface.get_at((w // 2, sample_y))[:3]
-
-        def is_greenish(col):
-            r, g, b = col[:3]
-            return (g > r + 10) and (g > b + 8) and (g > 40)
-
+        sky_sample = tuple(surface.get_at((w // 2, sample_y))[:3])
         start_y = int(h * 0.35)
         end_y = int(h * 0.85)
         step_x = max(1, w // 120)
-        for y in range(start_y, end_y):
-            samples = 0
-            green_count = 0
-            diff_from_sky = 0
-            for x in range(0, w, step_x):
-                samples += 1
-                col = surface.get_at((x, y))[:3]
-                if is_greenish(col):
-                    green_count += 1
-                dist = abs(col[0] - sky_sample[0]) + abs(col[1] - sky_sample[1]) + abs(col[2] - sky_sample[2])
-                if dist > 40:
-                    diff_from_sky += 1
-            if samples > 0:
-                green_frac = green_count / samples
-                diff_frac = diff_from_sky / samples
-                if green_frac > 0.18 and diff_frac > 0.25:
-                    return max(0, y - 2)
-                if diff_frac > 0.35:
-                    return max(0, y - 4)
+
+        if np is not None:
+            try:
+                y = _detect_ground_rows_numpy(surface, sky_sample, start_y, end_y, step_x)
+            except (ValueError, pygame.error):
+                y = _detect_ground_rows_python(surface, sky_sample, start_y, end_y, step_x)
+        else:
+            y = _detect_ground_rows_python(surface, sky_sample, start_y, end_y, step_x)
+        if y is not None:
+            return y
     except Exception:
         pass
     return int(HEIGHT * 0.8)
 
-def create_ground_surface(bg_surface, ground_y, height=56):
-    """Cria uma superfície que será usada como faixa de chão."""
+def _detect_ground_rows_numpy(surface, sky_sample, start_y, end_y, step_x, chunk_rows=64):
+    """Versão vetorizada: testa blocos de linhas de uma vez com surfarray."""
+    sky = np.array(sky_sample, dtype=np.int16)
+    view = pygame.surfarray.pixels3d(surface)
+    try:
+        columns = view[::step_x]
+        samples = columns.shape[0]
+        # Processa por blocos para poder parar cedo quando o chão está perto do topo
+        for y0 in range(start_y, end_y, chunk_rows):
+            block = columns[:, y0:min(y0 + chunk_rows, end_y)].astype(np.int16)
+            r, g, b = block[..., 0], block[..., 1], block[..., 2]
+
+            greenish = (g > r + 10) & (g > b + 8) & (g > 40)
+            dist = np.abs(block - sky).sum(axis=2)
+
+            green_counts = np.count_nonzero(greenish, axis=0)
+            diff_counts = np.count_nonzero(dist > 40, axis=0)
+            for i in np.flatnonzero((diff_counts / samples) > 0.25):
+                offset = _ground_row_match(int(green_counts[i]), int(diff_counts[i]), samples)
+                if offset is not None:
+                    return max(0, y0 + int(i) - offset)
+    finally:
+        del view
+    return None
+
+def _detect_ground_rows_python(surface, sky_sample, start_y, end_y, step_x):
+    """Versão em Python puro (usada quando o NumPy não está disponível)."""
+    w = surface.get_width()
+
+    def is_greenish(col):
+        r, g, b = col[:3]
+        return (g > r + 10) and (g > b + 8) and (g > 40)
+
+    for y in range(start_y, end_y):
+        samples = 0
+        green_count = 0
+        diff_from_sky = 0
+        for x in range(0, w, step_x):
+            samples += 1
+            col = surface.get_at((x, y))[:3]
+            if is_greenish(col):
+                green_count += 1
+            dist = abs(col[0] - sky_sample[0]) + abs(col[1] - sky_sample[1]) + abs(col[2] - sky_sample[2])
+            if dist > 40:
+                diff_from_sky += 1
+        if samples > 0:
+            offset = _ground_row_match(green_count, diff_from_sky, samples)
+            if offset is not None:
+                return max(0, y - offset)
+    return None
+
+def _sum_rgb_numpy(surface, sx, sy, ex, ey):
+    view = pygame.surfarray.pixels3d(surface)
     try:
-        w, h = bg_surface.get_size()
-        sample_w = max(10, w // 40)
-        sample_h = 8
-        sx = max(0, (w // 2) - sample_w // 2)
-        sy = max(0, min(h - sample_h, ground_y - sample_h // 2))
-
-        r = g = b = cnt = 0
-        for xx in range(sx, min(sx + sample_w, w)):
-            for yy in range(sy, min(sy + sample_h, h)):
+        return tuple(int(v) for v in view[sx:ex, sy:ey].reshape(-1, 3).sum(axis=0, dtype=np.int64))
+    finally:
+        del view
+
+def sample_ground_color(bg_surface, ground_y):
+    """Calcula a cor do chão a partir da média dos pixels junto à linha do chão."""
+    w, h = bg_surface.get_size()
+    sample_w = max(10, w // 40)
+    sample_h = 8
+    sx = max(0, (w // 2) - sample_w // 2)
+    sy = max(0, min(h - sample_h, ground_y - sample_h // 2))
+    ex = min(sx + sample_w, w)
+    ey = min(sy + sample_h, h)
+
+    r = g = b = cnt = 0
+    if np is not None and ex > sx and ey > sy:
+        # pixels3d rejeita alguns formatos (8 bits, pitch estranho): nesse caso usa get_at
+        try:
+            r, g, b = _sum_rgb_numpy(bg_surface, sx, sy, ex, ey)
+            cnt = (ex - sx) * (ey - sy)
+        except (ValueError, pygame.error):
+            r = g = b = cnt = 0
+    if cnt == 0:
+        for xx in range(sx, ex):
+            for yy in range(sy, ey):
                 cr, cg, cb, *_ = bg_surface.get_at((xx, yy))
                 r += cr; g += cg; b += cb; cnt += 1
-        if cnt == 0:
-            color = (80, 170, 70)
-        else:
-            r //= cnt; g //= cnt; b //= cnt
-            g = min(255, int(g * 1.4))
-            r = int(r * 0.7)
-            b = int(b * 0.7)
-            color = (r, g, b)
+    if cnt == 0:
+        return (80, 170, 70)
+    r //= cnt; g //= cnt; b //= cnt
+    g = min(255, int(g * 1.4))
+    r = int(r * 0.7)
+    b = int(b * 0.7)
+    return (r, g, b)
 
+def create_ground_surface(bg_surface, ground_y, height=56, color=None):
+    """Cria uma superfície que será usada como faixa de chão."""
+    try:
+        w = bg_surface.get_width()
+        if color is None:
+            color = sample_ground_color(bg_surface, ground_y)
         surf = pygame.Surface((w, height))
         surf.fill(color)
         return surf
@@ -93,6 +420,136 @@ def create_ground_surface(bg_surface, ground_y, height=56):
         surf.fill((80, 170, 70))
         return surf
 
+def find_asset_path(path, dirs=(ASSET_DIR, IMAGES_DIR)):
+    """Devolve o caminho do primeiro ficheiro existente nas pastas indicadas."""
+    for d in dirs:
+        full = os.path.join(d, path)
+        if os.path.isfile(full):
+            return full
+    return None
+
+def file_hash(path):
+    """Hash SHA-1 do conteúdo de um ficheiro."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def source_stamp(path):
+    """(mtime em ns, tamanho) de um ficheiro, para ver se mudou sem o ler."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+class FileHashes:
+    """Hashes SHA-1 de ficheiros, guardados com a data e o tamanho em HASH_CACHE_FILE.
+
+    hash() só lê o ficheiro se a data ou o tamanho mudaram desde a última vez.
+    O ficheiro é local (não vai para o git) e só save() o escreve, no thread principal.
+    """
+
+    def __init__(self, path=HASH_CACHE_FILE):
+        self.path = path
+        self.entries = None
+        self.changed = False
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.entries = data if isinstance(data, dict) else {}
+        except Exception:
+            self.entries = {}
+
+    def hash(self, path):
+        if self.entries is None:
+            self._load()
+        key = os.path.normpath(path)
+        mtime_ns, size = source_stamp(path)
+        entry = self.entries.get(key)
+        if entry and entry.get("mtime_ns") == mtime_ns and entry.get("size") == size:
+            return entry["sha1"]
+        digest = file_hash(path)
+        self.entries[key] = {"sha1": digest, "mtime_ns": mtime_ns, "size": size}
+        self.changed = True
+        return digest
+
+    def save(self):
+        if not self.changed:
+            return
+        try:
+            with open(self.path, "w") as f:
+                json.dump(self.entries, f, indent=2)
+            self.changed = False
+        except Exception as e:
+            print("Erro ao salvar cache de hashes:", e)
+
+# Partilhada pelo atlas e pela cache do chão
+FILE_HASHES = FileHashes()
+
+def load_ground_cache():
+    """Lê a cache de deteção do chão do ficheiro JSON."""
+    try:
+        with open(GROUND_CACHE_FILE, "r") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except:
+        return {}
+
+def save_ground_cache(data):
+    """Persiste a cache de deteção do chão no ficheiro JSON."""
+    try:
+        with open(GROUND_CACHE_FILE, "w") as f:
+            json.dump(data, f, indent=2)
+    except Exception as e:
+        print("Erro ao salvar cache do chão:", e)
+
+def get_ground_info(bg_name, bg_surface, manual_ground_y=MANUAL_GROUND_Y, rebuild=False):
+    """Devolve (ground_y, cor do chão) para o background, usando a cache em disco.
+
+    As entradas são indexadas por (hash do ficheiro, largura, altura); o hash
+    vem de FILE_HASHES, que só relê o ficheiro se a data ou o tamanho mudarem.
+    Se o background mudar (ou rebuild=True) a análise é refeita e a cache atualizada.
+    """
+    path = find_asset_path(bg_name)
+    digest = FILE_HASHES.hash(path) if path else None
+    FILE_HASHES.save()
+    w, h = bg_surface.get_size()
+    key = f"{digest}:{w}x{h}"
+
+    cache = load_ground_cache()
+    if rebuild:
+        cache.pop(key, None)
+    entry = cache.get(key)
+    if not isinstance(entry, dict):
+        entry = {"source": bg_name, "colors": {}}
+    changed = entry is not cache.get(key)
+
+    if manual_ground_y is not None:
+        ground_y = int(manual_ground_y)
+    else:
+        if "ground_y" not in entry:
+            entry["ground_y"] = detect_ground_y_from_bg(bg_surface)
+            changed = True
+        ground_y = entry["ground_y"]
+    ground_y = max(0, ground_y)
+
+    color = entry["colors"].get(str(ground_y))
+    if color is None:
+        color = sample_ground_color(bg_surface, ground_y)
+        entry["colors"][str(ground_y)] = list(color)
+        changed = True
+
+    # Só os backgrounds existentes ficam na cache (sem hash não há como invalidar)
+    if changed and digest is not None:
+        # Descarta versões antigas deste background (e entradas do formato antigo)
+        cache = {k: v for k, v in cache.items()
+                 if isinstance(v, dict) and "source" in v
+                 and (v["source"] != bg_name or k.startswith(digest + ":"))}
+        cache[key] = entry
+        save_ground_cache(cache)
+    return ground_y, tuple(color)
+
 def load_highscore():
     """Lê o highscore do ficheiro JSON."""
     try:
@@ -109,6 +566,103 @@ def save_highscore(value):
     except Exception as e:
         print("Erro ao salvar highscore:", e)
 
+class TextCache:
+    """Cache LRU de textos renderizados, indexada por (fonte, texto, cor)."""
+
+    def __init__(self, limit=TEXT_CACHE_SIZE):
+        self.limit = limit
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.limit:
+            self.entries.popitem(last=False)
+        return surf
+
+# Cache partilhada por HUD, menus e ecrãs finais
+TEXT_CACHE = TextCache()
+
+def render_text(font, text, color):
+    """Como font.render(text, True, color), mas reaproveitando superfícies já criadas."""
+    return TEXT_CACHE.render(font, text, color)
+
+class DigitAtlas:
+    """Glifos 0-9 de uma fonte e cor, renderizados uma vez para contadores numéricos.
+
+    Outros caracteres (o sinal de um número negativo, por exemplo) vêm de render_text.
+    """
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.glyphs = [font.render(str(d), True, color) for d in range(10)]
+        self.height = max(g.get_height() for g in self.glyphs)
+
+    def glyph(self, c):
+        if "0" <= c <= "9":
+            return self.glyphs[ord(c) - 48]
+        return render_text(self.font, c, self.color)
+
+    def width(self, digits):
+        return sum(self.glyph(c).get_width() for c in digits)
+
+    def draw(self, surface, digits, pos):
+        """Desenha a string de dígitos em pos; devolve a posição x final."""
+        x, y = pos
+        for c in digits:
+            glyph = self.glyph(c)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return x
+
+_DIGIT_ATLASES = {}
+
+def digit_atlas(font, color):
+    key = (font, tuple(color))
+    atlas = _DIGIT_ATLASES.get(key)
+    if atlas is None:
+        atlas = _DIGIT_ATLASES[key] = DigitAtlas(font, color)
+    return atlas
+
+def counter_width(font, label, value, color, suffix=""):
+    """Largura de um contador desenhado com draw_counter."""
+    w = render_text(font, label, color).get_width() if label else 0
+    w += digit_atlas(font, color).width(str(int(value)))
+    if suffix:
+        w += render_text(font, suffix, color).get_width()
+    return w
+
+def draw_counter(surface, font, label, value, color, pos, suffix=""):
+    """Desenha "label + número + suffix": textos fixos da TEXT_CACHE, dígitos do atlas.
+
+    Devolve o retângulo ocupado.
+    """
+    x, y = pos
+    atlas = digit_atlas(font, color)
+    h = atlas.height
+    if label:
+        label_surf = render_text(font, label, color)
+        surface.blit(label_surf, (x, y))
+        x += label_surf.get_width()
+        h = max(h, label_surf.get_height())
+    x = atlas.draw(surface, str(int(value)), (x, y))
+    if suffix:
+        suffix_surf = render_text(font, suffix, color)
+        surface.blit(suffix_surf, (x, y))
+        x += suffix_surf.get_width()
+        h = max(h, suffix_surf.get_height())
+    return pygame.Rect(pos[0], y, x - pos[0], h)
+
 def draw_button(surface, rect, text, base_color, hover_color, mouse_pos, selected=False, disabled=False):
     """Desenha um botão com sombra e efeitos visuais."""
     x, y, w, h = rect
@@ -130,16 +684,16 @@ def draw_button(surface, rect, text, base_color, hover_color, mouse_pos, selecte
         pygame.draw.rect(surface, (255, 255, 255), (x - 3, y - 3, w + 6, h + 6), 3, border_radius=10)
 
     label_color = BLACK if not disabled else (80, 80, 80)
-    label = BTN_FONT.render(text, True, label_color)
+    label = render_text(BTN_FONT, text, label_color)
     surface.blit(label, (x + (w - label.get_width()) // 2, y + (h - label.get_height()) // 2))
 
 def draw_progress_map(surface, score, level):
-    """Desenha uma barra de progresso no HUD para o nível atual."""
+    """Desenha uma barra de progresso no HUD para o nível atual; devolve a área ocupada."""
     from configuracoes import LEVEL_DISTANCES, WIDTH, HEIGHT, HUD_FONT, BLACK
     
     total = LEVEL_DISTANCES.get(level, 1000)
     if math.isinf(total):
-        return
+        return None
 
     progress = min(1.0, score / total)
 
@@ -174,16 +728,16 @@ def draw_progress_map(surface, score, level):
     pygame.draw.polygon(surface, (255, 200, 0), [(marker_x, marker_y + 12), (marker_x - 6, marker_y + 5), (marker_x + 6, marker_y + 5)])
 
     remaining = max(0, int(total - score))
-    meters_txt = f"{remaining}m"
-    m_surf = HUD_FONT.render(meters_txt, True, BLACK)
-    surface.blit(m_surf, (WIDTH // 2 - m_surf.get_width() // 2, bar_y + 12))
+    m_w = counter_width(HUD_FONT, "", remaining, BLACK, suffix="m")
+    text_rect = draw_counter(surface, HUD_FONT, "", remaining, BLACK, (WIDTH // 2 - m_w // 2, bar_y + 12), suffix="m")
+    return pygame.Rect(cat_x, flag_y, flag_x + 31 - cat_x, pole_h + 1).union(text_rect)
 
 def draw_boss_hp(surface, boss):
-    """Desenha a barra de HP do boss no HUD."""
+    """Desenha a barra de HP do boss no HUD; devolve a área ocupada."""
     from configuracoes import WIDTH, HEIGHT, HUD_FONT, BLACK
     
     if not boss:
-        return
+        return None
     bar_w = int(WIDTH * 0.25)
     bar_h = 14
     bar_x = WIDTH - bar_w - 30
@@ -192,5 +746,5 @@ def draw_boss_hp(surface, boss):
     pygame.draw.rect(surface, (100, 100, 100), (bar_x, bar_y, bar_w, bar_h), border_radius=4)
     pct = max(0.0, boss.hp / boss.max_hp)
     pygame.draw.rect(surface, (200, 30, 30), (bar_x, bar_y, int(bar_w * pct), bar_h), border_radius=4)
-    txt = HUD_FONT.render(f"Boss HP: {boss.hp}/{boss.max_hp}", True, BLACK)
-    surface.blit(txt, (bar_x, bar_y - 26))
+    text_rect = draw_counter(surface, HUD_FONT, "Boss HP: ", max(0, boss.hp), BLACK, (bar_x, bar_y - 26), suffix=f"/{boss.max_hp}")
+    return pygame.Rect(bar_x - 2, bar_y - 2, bar_w + 4, bar_h + 4).union(text_rect)
@@ -1,7 +1,74 @@
 import pygame
 import sys
 from configuracoes import *
-from funcionalidades import draw_button, load_image, save_highscore, load_highscore
+from funcionalidades import draw_button, load_image, save_highscore, load_highscore, render_text
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele o gradiente é desenhado linha a linha
+    np = None
+
+def wait_events(timeout_ms=MENU_IDLE_TIMEOUT_MS):
+    """Bloqueia até chegar um evento (ou até timeout_ms) e devolve os eventos pendentes."""
+    event = pygame.event.wait(timeout_ms)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    return events
+
+def is_expose_event(event):
+    """Eventos em que a janela tem de ser redesenhada por inteiro."""
+    return event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+
+def button_bounds(rect):
+    """Área ocupada por draw_button, incluindo a sombra e o contorno de seleção."""
+    x, y, w, h = rect
+    return pygame.Rect(x - 3, y - 3, w + 7, h + 7)
+
+class MenuButtons:
+    """Desenha botões guardando o seu estado visual, para redesenhar só os que mudam.
+
+    restore(surface, rect) repõe o fundo por baixo de um botão antes de o redesenhar.
+    """
+
+    def __init__(self, restore):
+        self.restore = restore
+        self.states = {}
+
+    def draw(self, screen, specs, mouse, full=False):
+        """specs: (rect, label, base, hover, selected, disabled). Devolve os rects alterados."""
+        dirty = []
+        for rect, label, base, hover, selected, disabled in specs:
+            key = tuple(rect)
+            state = (label, pygame.Rect(rect).collidepoint(mouse) or selected, selected, disabled)
+            if not full and self.states.get(key) == state:
+                continue
+            self.states[key] = state
+            bounds = button_bounds(rect)
+            if not full:
+                self.restore(screen, bounds)
+            draw_button(screen, rect, label, base, hover, mouse, selected=selected, disabled=disabled)
+            dirty.append(bounds)
+        return dirty
+
+def loading_bar_rect():
+    """Área da barra de carregamento desenhada no menu principal."""
+    return pygame.Rect(WIDTH // 2 - 220, HEIGHT - 110, 440, 60)
+
+def draw_loading_bar(surface, progress):
+    """Desenha a barra de progresso do carregamento em segundo plano; devolve a área ocupada."""
+    area = loading_bar_rect()
+    bar = pygame.Rect(area.x, area.bottom - 14, area.w, 14)
+    pygame.draw.rect(surface, (40, 40, 40), bar, border_radius=6)
+    fill = bar.inflate(-4, -4)
+    fill.w = int(fill.w * progress)
+    if fill.w > 0:
+        pygame.draw.rect(surface, (255, 200, 0), fill, border_radius=5)
+    txt = render_text(HUD_FONT, "A carregar...", WHITE)
+    surface.blit(txt, (area.centerx - txt.get_width() // 2, area.y))
+    return area
+
+def fill_white(surface, rect):
+    surface.fill(WHITE, rect)
 
 def death_screen(screen, score, highscore):
     """Tela mostrada quando o jogador morre."""
@@ -25,16 +92,16 @@ def death_screen(screen, score, highscore):
         overlay.fill((100, 0, 0, alpha))
         screen.blit(overlay, (0, 0))
 
-        msg = TITLE_FONT.render("Você Morreu!", True, (255, 230, 230))
+        msg = render_text(TITLE_FONT, "Você Morreu!", (255, 230, 230))
         screen.blit(msg, (WIDTH // 2 - msg.get_width() // 2, int(HEIGHT * 0.3)))
 
-        scr = HUD_FONT.render(f"Score: {score}", True, WHITE)
+        scr = render_text(HUD_FONT, f"Score: {score}", WHITE)
         screen.blit(scr, (WIDTH // 2 - scr.get_width() // 2, int(HEIGHT * 0.42)))
 
-        high_txt = HUD_FONT.render(f"Melhor Pontuação: {highscore}", True, WHITE)
+        high_txt = render_text(HUD_FONT, f"Melhor Pontuação: {highscore}", WHITE)
         screen.blit(high_txt, (WIDTH // 2 - high_txt.get_width() // 2, int(HEIGHT * 0.48)))
 
-        msg2 = HUD_FONT.render("Voltando ao menu...", True, WHITE)
+        msg2 = render_text(HUD_FONT, "Voltando ao menu...", WHITE)
         screen.blit(msg2, (WIDTH // 2 - msg2.get_width() // 2, int(HEIGHT * 0.55)))
 
         pygame.display.update()
@@ -45,13 +112,15 @@ def death_screen(screen, score, highscore):
 
 def level_complete_screen(screen, level, score, highscore, has_next_level):
     """Tela mostrada quando um nível é concluído."""
-    clock = pygame.time.Clock()
+    redraw = True
     
     while True:
-        for event in pygame.event.get():
+        for event in (pygame.event.get() if redraw else wait_events()):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if is_expose_event(event):
+                redraw = True
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_RETURN, pygame.K_d, pygame.K_RIGHT):
                     if has_next_level:
@@ -59,70 +128,104 @@ def level_complete_screen(screen, level, score, highscore, has_next_level):
                 if event.key in (pygame.K_ESCAPE, pygame.K_SPACE, pygame.K_a, pygame.K_LEFT):
                     return "menu"
 
+        # Ecrã estático: só é desenhado quando necessário
+        if not redraw:
+            continue
+        redraw = False
+
         screen.fill(WHITE)
-        msg = TITLE_FONT.render(f"Level {level} Concluído!", True, (20, 160, 60))
+        msg = render_text(TITLE_FONT, f"Level {level} Concluído!", (20, 160, 60))
         screen.blit(msg, (WIDTH // 2 - msg.get_width() // 2, int(HEIGHT * 0.28)))
 
-        scr = HUD_FONT.render(f"Score: {score}", True, BLACK)
+        scr = render_text(HUD_FONT, f"Score: {score}", BLACK)
         screen.blit(scr, (WIDTH // 2 - scr.get_width() // 2, int(HEIGHT * 0.4)))
 
-        high_txt = HUD_FONT.render(f"High: {highscore}", True, BLACK)
+        high_txt = render_text(HUD_FONT, f"High: {highscore}", BLACK)
         screen.blit(high_txt, (WIDTH // 2 - high_txt.get_width() // 2, int(HEIGHT * 0.46)))
 
         if has_next_level:
-            instr1 = HUD_FONT.render("ENTER/D → Próximo nível", True, BLACK)
+            instr1 = render_text(HUD_FONT, "ENTER/D → Próximo nível", BLACK)
             screen.blit(instr1, (WIDTH // 2 - instr1.get_width() // 2, int(HEIGHT * 0.56)))
-        instr2 = HUD_FONT.render("ESC/ESPAÇO/A ← Voltar ao menu", True, BLACK)
+        instr2 = render_text(HUD_FONT, "ESC/ESPAÇO/A ← Voltar ao menu", BLACK)
         screen.blit(instr2, (WIDTH // 2 - instr2.get_width() // 2, int(HEIGHT * 0.62)))
 
         pygame.display.update()
-        clock.tick(FPS)
 
 def victory_screen(screen, score, highscore):
     """Tela mostrada quando o jogador derrota o boss final."""
-    clock = pygame.time.Clock()
+    redraw = True
     
     while True:
-        for event in pygame.event.get():
+        for event in (pygame.event.get() if redraw else wait_events()):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if is_expose_event(event):
+                redraw = True
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_RETURN, pygame.K_ESCAPE, pygame.K_SPACE):
                     return
 
+        # Ecrã estático: só é desenhado quando necessário
+        if not redraw:
+            continue
+        redraw = False
+
         screen.fill(WHITE)
-        msg = TITLE_FONT.render("Vitória!", True, (20, 160, 60))
+        msg = render_text(TITLE_FONT, "Vitória!", (20, 160, 60))
         screen.blit(msg, (WIDTH // 2 - msg.get_width() // 2, int(HEIGHT * 0.25)))
 
-        scr = HUD_FONT.render(f"Score: {score}", True, BLACK)
+        scr = render_text(HUD_FONT, f"Score: {score}", BLACK)
         screen.blit(scr, (WIDTH // 2 - scr.get_width() // 2, int(HEIGHT * 0.38)))
 
-        high_txt = HUD_FONT.render(f"High: {highscore}", True, BLACK)
+        high_txt = render_text(HUD_FONT, f"High: {highscore}", BLACK)
         screen.blit(high_txt, (WIDTH // 2 - high_txt.get_width() // 2, int(HEIGHT * 0.44)))
 
-        frase = HUD_FONT.render("Parabéns agora és um Super Gatão!", True, (0, 120, 0))
+        frase = render_text(HUD_FONT, "Parabéns agora és um Super Gatão!", (0, 120, 0))
         screen.blit(frase, (WIDTH // 2 - frase.get_width() // 2, int(HEIGHT * 0.52)))
 
-        instr = HUD_FONT.render("ENTER / ESC / ESPAÇO → Menu", True, BLACK)
+        instr = render_text(HUD_FONT, "ENTER / ESC / ESPAÇO → Menu", BLACK)
         screen.blit(instr, (WIDTH // 2 - instr.get_width() // 2, int(HEIGHT * 0.60)))
 
         pygame.display.update()
-        clock.tick(FPS)
 
 def creditos(screen):
     """Tela de créditos e comandos."""
-    clock = pygame.time.Clock()
+    btn_w, btn_h = 220, 60
+    btn_x = WIDTH // 2 - btn_w // 2
+    btn_y = HEIGHT - 100
+    back_rect = (btn_x, btn_y, btn_w, btn_h)
+
+    buttons = MenuButtons(restore=fill_white)
+    redraw = True
     
     while True:
+        # Antes do primeiro desenho não se bloqueia à espera de input
+        events = pygame.event.get() if redraw else wait_events()
         mouse = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if is_expose_event(event):
+                redraw = True
+            # Clique do mouse no botão 'Voltar'
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if pygame.Rect(back_rect).collidepoint(event.pos):
+                    pygame.time.delay(120)
+                    return
+
+        specs = [(back_rect, "Voltar", GRAY, (170, 170, 170), False, False)]
+        if not redraw:
+            # Só o botão pode mudar (hover)
+            dirty = buttons.draw(screen, specs, mouse)
+            if dirty:
+                pygame.display.update(dirty)
+            continue
+        redraw = False
 
         screen.fill(WHITE)
-        title = TITLE_FONT.render("Créditos / Comandos", True, BLACK)
+        title = render_text(TITLE_FONT, "Créditos / Comandos", BLACK)
         screen.blit(title, (WIDTH // 2 - title.get_width() // 2, int(HEIGHT * 0.08)))
 
         linhas = [
@@ -140,39 +243,74 @@ def creditos(screen):
 
         y = int(HEIGHT * 0.22)
         for linha in linhas:
-            txt = HUD_FONT.render(linha, True, BLACK)
+            txt = render_text(HUD_FONT, linha, BLACK)
             screen.blit(txt, (WIDTH // 2 - txt.get_width() // 2, y))
             y += 40
 
-        btn_w, btn_h = 220, 60
-        btn_x = WIDTH // 2 - btn_w // 2
-        btn_y = HEIGHT - 100
-        back_rect = (btn_x, btn_y, btn_w, btn_h)
-        draw_button(screen, back_rect, "Voltar", GRAY, (170, 170, 170), mouse)
-
-        # Clique do mouse no botão 'Voltar'
-        if pygame.mouse.get_pressed()[0]:
-            if pygame.Rect(back_rect).collidepoint(pygame.mouse.get_pos()):
-                pygame.time.delay(120)
-                return
-
+        buttons.draw(screen, specs, mouse, full=True)
         pygame.display.update()
-        clock.tick(FPS)
+
+# Superfícies estáticas dos menus, criadas uma vez por resolução/texto
+_MENU_SURFACES = {}
+
+def menu_background(size):
+    """Gradiente do fundo do menu para a resolução dada (criado uma única vez)."""
+    key = ("background", tuple(size))
+    surf = _MENU_SURFACES.get(key)
+    if surf is not None:
+        return surf
+
+    w, h = size
+    if np is not None:
+        t = np.arange(h) / h
+        column = np.stack([
+            255 * (1 - t) + 80 * t,
+            120 * (1 - t) + 0 * t,
+            200 * (1 - t) + 120 * t,
+        ], axis=1).astype(np.uint8)
+        pixels = np.ascontiguousarray(np.broadcast_to(column, (w, h, 3)))
+        surf = pygame.surfarray.make_surface(pixels)
+    else:
+        # Sem NumPy: desenha uma coluna de 1 px e estica-a na horizontal
+        column = pygame.Surface((1, h))
+        for i in range(h):
+            t = i / h
+            r = int(255 * (1 - t) + 80 * t)
+            g = int(120 * (1 - t) + 0 * t)
+            b = int(200 * (1 - t) + 120 * t)
+            column.set_at((0, i), (r, g, b))
+        surf = pygame.transform.scale(column, (w, h))
+
+    surf = surf.convert()
+    _MENU_SURFACES[key] = surf
+    return surf
 
 def draw_menu_background(surface):
     """Desenha um gradiente simples como fundo do menu."""
-    for i in range(HEIGHT):
-        t = i / HEIGHT
-        r = int(255 * (1 - t) + 80 * t)
-        g = int(120 * (1 - t) + 0 * t)
-        b = int(200 * (1 - t) + 120 * t)
-        pygame.draw.line(surface, (r, g, b), (0, i), (WIDTH, i))
+    surface.blit(menu_background(surface.get_size()), (0, 0))
+
+def menu_title(text, color=(255, 240, 0), outline_color=(0, 0, 0), offset=2):
+    """Título com contorno, composto uma vez numa só superfície com margem de offset px."""
+    key = ("title", text, color, outline_color, offset)
+    surf = _MENU_SURFACES.get(key)
+    if surf is not None:
+        return surf
+
+    fill = TITLE_FONT_MENU.render(text, True, color)
+    outline = TITLE_FONT_MENU.render(text, True, outline_color)
+    w, h = fill.get_size()
+    surf = pygame.Surface((w + 2 * offset, h + 2 * offset), pygame.SRCALPHA)
+    # Desenha um pequeno contorno deslocado para criar efeito de outline
+    for dx, dy in [(-offset, 0), (offset, 0), (0, -offset), (0, offset)]:
+        surf.blit(outline, (offset + dx, offset + dy))
+    surf.blit(fill, (offset, offset))
+    _MENU_SURFACES[key] = surf
+    return surf
 
 def level_select_menu(screen):
     """Tela para selecionar nível."""
     from configuracoes import unlocked_levels
     
-    clock = pygame.time.Clock()
     selected_idx = 0
     levels = [1, 2, 3, 4, 5]
     buttons = []
@@ -196,12 +334,19 @@ def level_select_menu(screen):
     back_btn_y = HEIGHT - 100
     back_rect = (back_btn_x, back_btn_y, back_btn_w, back_btn_h)
 
+    buttons_view = MenuButtons(restore=fill_white)
+    redraw = True
+
     while True:
+        # Antes do primeiro desenho não se bloqueia à espera de input
+        events = pygame.event.get() if redraw else wait_events()
         mouse = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif is_expose_event(event):
+                redraw = True
             elif event.type == pygame.KEYDOWN:
                 # Navegação por teclado
                 if event.key in (pygame.K_DOWN, pygame.K_s):
@@ -231,26 +376,33 @@ def level_select_menu(screen):
                     pygame.time.delay(120)
                     return
 
-        # Desenha interface
-        screen.fill(WHITE)
-        title = TITLE_FONT.render("Selecionar Nível", True, BLACK)
-        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, int(HEIGHT * 0.12)))
-
+        specs = []
         for i, b in enumerate(buttons):
             lvl = b["level"]
             disabled = lvl > unlocked_levels
             label = b["label"] + (" (bloqueado)" if disabled else "")
             is_selected = (i == selected_idx)
-            draw_button(screen, b["rect"], label, PRIMARY, PRIMARY_HOVER, mouse, selected=is_selected, disabled=disabled)
+            specs.append((b["rect"], label, PRIMARY, PRIMARY_HOVER, is_selected, disabled))
+        specs.append((back_rect, "Voltar", GRAY, (170, 170, 170), False, False))
 
-        draw_button(screen, back_rect, "Voltar", GRAY, (170, 170, 170), mouse)
+        if not redraw:
+            # Só redesenha os botões cujo hover/seleção mudou
+            dirty = buttons_view.draw(screen, specs, mouse)
+            if dirty:
+                pygame.display.update(dirty)
+            continue
+        redraw = False
 
+        # Desenha interface
+        screen.fill(WHITE)
+        title = render_text(TITLE_FONT, "Selecionar Nível", BLACK)
+        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, int(HEIGHT * 0.12)))
+
+        buttons_view.draw(screen, specs, mouse, full=True)
         pygame.display.update()
-        clock.tick(FPS)
 
 def menu(screen):
-    """Menu principal do jogo."""
-    clock = pygame.time.Clock()
+    """Menu principal do jogo (só redesenha quando há input ou o hover muda)."""
     selected_idx = 0
 
     buttons = [
@@ -264,12 +416,31 @@ def menu(screen):
          "base": RED, "hover": RED_HOVER, "action": "quit"},
     ]
 
+    def restore_background(surface, rect):
+        surface.blit(menu_background(surface.get_size()), rect, rect)
+
+    buttons_view = MenuButtons(restore=restore_background)
+    redraw = True
+
+    # Assets de jogo a carregar em segundo plano (o menu continua interativo)
+    from carregamento import preloader
+    loader = preloader()
+    bar_shown = False
+
     while True:
+        loading = loader is not None and not loader.finished
+        # Antes do primeiro desenho não se bloqueia à espera de input
+        if redraw:
+            events = pygame.event.get()
+        else:
+            events = wait_events(1000 // FPS if loading else MENU_IDLE_TIMEOUT_MS)
         mouse = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif is_expose_event(event):
+                redraw = True
             elif event.type == pygame.KEYDOWN:
                 # Teclado: navegar e confirmar
                 if event.key in (pygame.K_DOWN, pygame.K_s):
@@ -288,6 +459,7 @@ def menu(screen):
                     elif action == "quit":
                         pygame.quit()
                         sys.exit()
+                    redraw = True
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # Clique do mouse nos botões
                 for i, b in enumerate(buttons):
@@ -302,25 +474,43 @@ def menu(screen):
                         elif b["action"] == "quit":
                             pygame.quit()
                             sys.exit()
+                        redraw = True
+
+        # O ecrã pode ter mudado enquanto outro ecrã estava aberto
+        if redraw:
+            mouse = pygame.mouse.get_pos()
+
+        specs = [(b["rect"], b["label"], b["base"], b["hover"], i == selected_idx, False)
+                 for i, b in enumerate(buttons)]
+
+        if not redraw:
+            # Só redesenha os botões cujo hover/seleção mudou
+            dirty = buttons_view.draw(screen, specs, mouse)
+            # Barra de carregamento: avança o loader e redesenha só a sua área
+            if loading or bar_shown:
+                if loading:
+                    loader.poll()
+                bar = loading_bar_rect()
+                restore_background(screen, bar)
+                bar_shown = not loader.finished
+                if bar_shown:
+                    draw_loading_bar(screen, loader.progress)
+                dirty.append(bar)
+            if dirty:
+                pygame.display.update(dirty)
+            continue
+        redraw = False
 
         # Desenha fundo e títulos
         draw_menu_background(screen)
 
-        title = TITLE_FONT_MENU.render("Super Cat Runner", True, (255, 240, 0))
-        outline_color = (0, 0, 0)
-
-        # Desenha um pequeno contorno deslocado para criar efeito de outline
-        for dx, dy in [(-2, 0), (2, 0), (0, -2), (0, 2)]:
-            shadow = TITLE_FONT_MENU.render("Super Cat Runner", True, outline_color)
-            screen.blit(shadow, (WIDTH // 2 - shadow.get_width() // 2 + dx,
-                                 int(HEIGHT * 0.12) + dy))
-        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, int(HEIGHT * 0.12)))
+        # Título com contorno já composto (a superfície tem 2 px de margem)
+        title = menu_title("Super Cat Runner")
+        screen.blit(title, (WIDTH // 2 - (title.get_width() - 4) // 2 - 2, int(HEIGHT * 0.12) - 2))
 
         # Desenha botões e destaques
-        for i, b in enumerate(buttons):
-            is_selected = (i == selected_idx)
-            draw_button(screen, b["rect"], b["label"], b["base"], b["hover"], mouse, selected=is_selected)
-
+        buttons_view.draw(screen, specs, mouse, full=True)
+        bar_shown = loading
+        if loading:
+            draw_loading_bar(screen, loader.progress)
         pygame.display.update()
-        clock.tick(FPS)
-
@@ -0,0 +1,566 @@
+import pygame
+import random
+import math
+import configuracoes
+from configuracoes import *
+from funcionalidades import (
+    load_image, preload_images, get_ground_info, create_ground_surface,
+    draw_progress_map, draw_boss_hp, draw_counter
+)
+from colisoes import SpatialHash
+from ciclo_vida import LifetimeManager
+from carregamento import finish_preload
+from entidades import (
+    Gato, Projetil, BossProjetil, Tronco, Bird, PowerUp, Boss, Pool, EntityList, ENTITY_IMAGES, TRONCO_BANK
+)
+from entidades_vetor import ObstacleStore, PowerUpStore, ProjectileStore, VECTOR_STORE_AVAILABLE
+
+def load_level_assets():
+    """Prepara as imagens do nível e devolve (bg, superfície do chão, ground_y)."""
+    # Se o menu ainda está a carregar em segundo plano, termina esse trabalho primeiro
+    finish_preload()
+
+    # Carrega todas as imagens do nível para a cache (o loop não acede ao disco)
+    preload_images(ENTITY_IMAGES)
+    TRONCO_BANK.prebuild()
+
+    # Carrega background
+    bg = load_image("game_bg.png", (WIDTH, HEIGHT))
+
+    # Posição e cor do chão (detetadas uma vez e guardadas em GROUND_CACHE_FILE)
+    ground_y, ground_color = get_ground_info("game_bg.png", bg)
+
+    # Cria superfície verde do chão
+    ground_height = 56
+    ground_surface = create_ground_surface(bg, ground_y, height=ground_height, color=ground_color)
+    return bg, ground_surface, ground_y
+
+class RngStreams:
+    """Geradores aleatórios independentes derivados de uma única semente.
+
+    Cada subsistema tem o seu stream, por isso mudar o uso de um (ex.: mais
+    efeitos visuais) não altera as sequências dos outros.
+    """
+
+    NAMES = ("spawn", "boss", "visual")
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        for name in self.NAMES:
+            setattr(self, name, random.Random(f"{seed}:{name}"))
+
+class SimClock:
+    """Relógio da simulação: conta ticks em vez de ler o tempo real."""
+
+    __slots__ = ("ticks",)
+
+    def __init__(self):
+        self.ticks = 0
+
+    def advance(self):
+        self.ticks += 1
+
+    def ms(self):
+        """Tempo simulado em milissegundos (equivalente a pygame.time.get_ticks)."""
+        return self.ticks * 1000.0 / FPS
+
+class Nivel:
+    """Estado de um nível em curso, avançado em ticks de duração fixa (1/FPS s).
+
+    tick() corre a lógica de jogo de um passo e devolve o resultado quando o
+    nível termina; draw() desenha o estado interpolado entre os dois últimos ticks.
+    """
+
+    def __init__(self, level, bg, ground_surface, ground_y, highscore=0, seed=None,
+                 spawn_scale=1.0, invulnerable=False, entity_store=None):
+        """spawn_scale multiplica o ritmo e o limite de obstáculos; invulnerable ignora
+        as colisões mortais. Ambos servem para benchmarks e testes de carga.
+        entity_store ("objects" ou "numpy") sobrepõe-se a ENTITY_STORE."""
+        self.level = level
+        self.rng = RngStreams(seed)
+        self.seed = self.rng.seed
+        self.clock = SimClock()
+        self.bg = bg
+        self.ground_surface = ground_surface
+        self.ground_y = ground_y
+        self.highscore = highscore
+
+        # Instancia o jogador
+        self.gato = Gato()
+        self.gato.Y_POS = ground_y - self.gato.rect.height
+        self.gato.y = float(self.gato.Y_POS)
+        self.gato.rect.topleft = (self.gato.X_POS, self.gato.Y_POS)
+        self.gato.prev_pos = self.gato.rect.topleft
+
+        # Entidades dinâmicas: listas de objetos e pools de projéteis (sem alocações
+        # durante o combate), ou as stores NumPy equivalentes de entidades_vetor
+        store = entity_store or configuracoes.ENTITY_STORE
+        self.vector_store = store == "numpy" and VECTOR_STORE_AVAILABLE
+        if self.vector_store:
+            self.obstacles = ObstacleStore()
+            self.powerups = PowerUpStore()
+            self.bullets = ProjectileStore(Projetil, PLAYER_BULLET_POOL_SIZE)
+            self.boss_bullets = ProjectileStore(BossProjetil, BOSS_BULLET_POOL_SIZE)
+        else:
+            self.obstacles = EntityList()
+            self.powerups = EntityList()
+            self.bullets = Pool(Projetil, PLAYER_BULLET_POOL_SIZE)
+            self.boss_bullets = Pool(BossProjetil, BOSS_BULLET_POOL_SIZE)
+
+        # Grelhas de colisão (broadphase) dos tiros, reutilizadas a cada tick
+        self.egg_grid = SpatialHash()
+        self.obstacle_grid = SpatialHash()
+
+        # Remoção fora do ecrã e cull do desenho, iguais para todos os grupos
+        self.lifetime = LifetimeManager()
+
+        # Variáveis de jogo
+        self.score = 0
+        self.speed = 12 + 2 * (level - 1)
+        self.pending_shots = 0
+
+        self.bg_x = 0
+        self.bg_speed = 4
+
+        self.spawn_scale = spawn_scale
+        self.invulnerable = invulnerable
+
+        # Temporizadores
+        self.obstacle_spawn_interval = max(26, 64 - (level - 1) * 6)
+        self.obstacle_spawn_timer = self.obstacle_spawn_interval
+        self.max_obstacles_base = 5
+
+        if level == 5:
+            self.powerup_spawn_interval = 220
+        else:
+            self.powerup_spawn_interval = 480
+        self.powerup_spawn_timer = 0
+
+        self.level_distance = LEVEL_DISTANCES.get(level, 1000)
+
+        # Se é boss level, inicializa o boss
+        self.boss = None
+        self.boss_active = False
+        if math.isinf(self.level_distance):
+            self.boss = Boss(self.rng.boss)
+            self.boss_active = True
+
+        # Opções de desenho (ajustadas pelo QualityGovernor; não afetam a simulação)
+        self.boss_flash = True
+
+        # Profiler de fases (perfil.FrameProfiler); None = desligado
+        self.profiler = None
+
+    @property
+    def ticks(self):
+        return self.clock.ticks
+
+    def entity_counts(self):
+        """Nº de entidades vivas por tipo e vivas/desenhadas/cortadas no último draw (para o profiler)."""
+        return {
+            "obstaculos": len(self.obstacles),
+            "powerups": len(self.powerups),
+            "tiros": len(self.bullets),
+            "ovos": len(self.boss_bullets),
+            **self.lifetime.counts(),
+        }
+
+    def groups(self):
+        """Os contentores de entidades dinâmicas (EntityList/Pool ou stores NumPy)."""
+        return (self.bullets, self.boss_bullets, self.obstacles, self.powerups)
+
+    def entities(self):
+        """Todas as entidades vivas (jogador incluído)."""
+        yield self.gato
+        yield from self.bullets
+        yield from self.boss_bullets
+        yield from self.obstacles
+        yield from self.powerups
+        if self.boss_active and self.boss:
+            yield self.boss
+
+    def request_shot(self):
+        """Regista um disparo (tecla X) para ser feito no próximo tick."""
+        self.pending_shots += 1
+
+    def tick(self, user_input):
+        """Avança a simulação um tick.
+
+        Devolve None enquanto o nível continua, ou "complete", "victory",
+        "obstacle", "boss_bullet" ou "boss" (causa da morte) quando termina.
+        """
+        gato = self.gato
+        boss = self.boss
+        gato.prev_pos = gato.rect.topleft
+        if self.boss_active and boss:
+            boss.prev_pos = boss.rect.topleft
+        for group in self.groups():
+            group.save_prev()
+
+        # ========== DISPAROS ==========
+        for _ in range(self.pending_shots):
+            if gato.can_shoot:
+                gato.shoot()
+                self.bullets.spawn(gato.rect.right, gato.rect.centery)
+        self.pending_shots = 0
+
+        # ========== ATUALIZAÇÕES ==========
+        gato.update(user_input)
+        prof = self.profiler
+        if prof:
+            prof.lap("atualizacoes")
+
+        # Verifica se completou o nível
+        if not math.isinf(self.level_distance) and self.score >= self.level_distance:
+            return "complete"
+
+        # ========== LÓGICA DO BOSS ==========
+        if self.boss_active and boss:
+            boss.update(gato.rect)
+
+            if boss.should_shoot_now():
+                on_ground = (boss.rect.bottom >= self.ground_y - 2)
+                offset_y = self.rng.boss.randint(-34, 34)
+                bullet_y = boss.rect.centery + offset_y
+
+                if on_ground:
+                    vx = -13
+                    vy = 0
+                else:
+                    dy = (gato.rect.centery - boss.rect.centery)
+                    vy = max(min(dy * 0.06, 8), -2)
+                    vx = -10
+                spawn_x = boss.rect.left - 20
+                self.boss_bullets.spawn(spawn_x, bullet_y, vx=vx, vy=vy)
+
+            if boss.hp <= 0:
+                return "victory"
+
+            if gato.rect.colliderect(boss.get_collision_rect()) and not self.invulnerable:
+                return "boss"
+        if prof:
+            prof.lap("boss")
+
+        # ========== PROJÉTEIS ==========
+        # Broadphase: grelhas com as posições atuais dos ovos e dos obstáculos
+        # (só são precisas se houver tiros do jogador)
+        egg_grid = self.egg_grid
+        if len(self.bullets):
+            egg_grid.rebuild(self.boss_bullets.live(), self.boss_bullets.rects())
+            self.obstacle_grid.rebuild(self.obstacles.live(), self.obstacles.rects())
+        dead_eggs = set()
+        dead_obstacles = set()
+        dead_bullets = []
+        self.bullets.move()
+        for bullet in self.bullets:
+            rect = bullet.rect
+            hit = egg_grid.first_collision(rect, dead_eggs)
+            if hit is not None:
+                dead_eggs.add(hit)
+                dead_bullets.append(bullet)
+                continue
+
+            if self.boss_active and boss and rect.colliderect(boss.get_collision_rect()):
+                boss.take_hit(from_state=boss.state)
+                dead_bullets.append(bullet)
+                continue
+
+            hit = self.obstacle_grid.first_collision(rect, dead_obstacles)
+            if hit is not None:
+                dead_obstacles.add(hit)
+                dead_bullets.append(bullet)
+        for bullet in dead_bullets:
+            self.bullets.release(bullet)
+        lifetime = self.lifetime
+        lifetime.despawn(self.bullets)
+        for i in dead_eggs:
+            self.boss_bullets.release(egg_grid.items[i])
+        self.obstacles.remove_indices(dead_obstacles)
+
+        # Contra o jogador basta um teste em lote (collidelistall ou AABB vetorial)
+        self.boss_bullets.move()
+        if self.boss_bullets.overlaps(gato.rect) and not self.invulnerable:
+            return "boss_bullet"
+        lifetime.despawn(self.boss_bullets)
+        if prof:
+            prof.lap("projeteis")
+
+        # ========== OBSTÁCULOS ==========
+        if not self.boss_active:
+            self.obstacle_spawn_timer -= 1
+            if self.obstacle_spawn_timer <= 0:
+                self.spawn_obstacle()
+
+            self.obstacles.move(self.speed, self.clock.ms())
+            if self.obstacles.overlaps(gato.rect) and not self.invulnerable:
+                return "obstacle"
+            lifetime.despawn(self.obstacles)
+        if prof:
+            prof.lap("obstaculos")
+
+        # ========== POWERUPS ==========
+        self.powerup_spawn_timer -= 1
+        if self.powerup_spawn_timer <= 0 and len(self.powerups) == 0:
+            if math.isinf(self.level_distance):
+                chance = 1
+            else:
+                chance = 3
+            if self.rng.spawn.randint(0, chance) == 0:
+                self.powerups.append(PowerUp())
+            self.powerup_spawn_timer = self.powerup_spawn_interval
+
+        self.powerups.move(self.speed, self.clock.ms())
+        picked = self.powerups.overlaps(gato.rect)
+        for _ in picked:
+            gato.activate_powerup(10)
+        self.powerups.remove_indices(picked)
+        lifetime.despawn(self.powerups)
+
+        # Fundo e pontuação
+        self.bg_x -= self.bg_speed
+        if self.bg_x <= -WIDTH:
+            self.bg_x = 0
+
+        self.score += 1
+        self.clock.advance()
+        if prof:
+            prof.lap("powerups")
+            prof.ticks += 1
+        return None
+
+    def spawn_obstacle(self):
+        """Tenta criar um tronco ou pássaro e sorteia o próximo intervalo."""
+        level = self.level
+        scale = self.spawn_scale
+        max_obstacles = int((self.max_obstacles_base + level) * scale)
+        min_spacing = int(WIDTH * max(0.18, 0.35 - 0.03 * (level - 1)))
+        rightmost = max((obs.rect.right for obs in self.obstacles), default=-9999)
+        # Com spawn_scale > 1 a distância a percorrer pelo último obstáculo encolhe na mesma proporção
+        spawn_edge = WIDTH + 50 + CACTUS_MAX_WIDTH
+        limit = spawn_edge - (spawn_edge - (WIDTH - min_spacing)) / scale
+        if len(self.obstacles) < max_obstacles and rightmost <= limit:
+            bird_prob = min(0.5, 0.12 + 0.06 * (level - 1))
+            if level >= 3:
+                bird_prob = min(0.45, bird_prob + 0.06)
+            if self.rng.spawn.random() < bird_prob:
+                self.obstacles.append(Bird(self.rng.spawn, self.rng.visual))
+            else:
+                self.obstacles.append(Tronco(self.rng.spawn))
+
+        base_interval = max(22, 70 - level * 8)
+        interval = base_interval + self.rng.spawn.randint(-8, 12)
+        self.obstacle_spawn_interval = max(18, interval - (self.score // 2000))
+        if scale != 1.0:
+            self.obstacle_spawn_interval = max(1, int(self.obstacle_spawn_interval / scale))
+        self.obstacle_spawn_timer = self.obstacle_spawn_interval
+
+    def draw(self, screen, alpha=1.0):
+        """Desenha o nível; alpha (0..1) interpola entre o tick anterior e o atual."""
+        # ========== DESENHO ==========
+        self.draw_playfield(screen, alpha)
+        if self.profiler:
+            self.profiler.lap("desenho")
+        self.draw_hud(screen)
+        if self.profiler:
+            self.profiler.lap("hud")
+
+    def draw_playfield(self, screen, alpha=1.0):
+        """Desenha fundo, chão e entidades (tudo menos o HUD)."""
+        # O fundo é periódico em WIDTH, por isso basta recuar o deslocamento
+        bg_x = self.bg_x + self.bg_speed * (1.0 - alpha)
+        if bg_x > 0:
+            bg_x -= WIDTH
+
+        screen.fill(WHITE)
+        screen.blit(self.bg, (bg_x, 0))
+        screen.blit(self.bg, (bg_x + WIDTH, 0))
+        screen.blit(self.ground_surface, (bg_x, self.ground_y))
+        screen.blit(self.ground_surface, (bg_x + WIDTH, self.ground_y))
+
+        self.draw_sprites(screen, alpha)
+
+    def draw_sprites(self, screen, alpha=1.0):
+        """Desenha as entidades e devolve os retângulos onde foram desenhadas."""
+        rects = [self.gato.draw(screen, alpha)]
+        rects.extend(self.lifetime.draw(screen, self.groups(), alpha))
+        if self.boss_active and self.boss:
+            rects.append(self.boss.draw(screen, alpha, flash=self.boss_flash))
+        return rects
+
+    def draw_hud(self, screen):
+        """Desenha o HUD e devolve as áreas ocupadas."""
+        # HUD (textos fixos em cache e dígitos do atlas: sem rasterizar fontes por frame)
+        hud_x = WIDTH - 260
+        rects = [
+            draw_counter(screen, HUD_FONT, "Score: ", self.score, BLACK, (hud_x, 20)),
+            draw_counter(screen, HUD_FONT, "Level: ", self.level, BLACK, (hud_x, 55)),
+            draw_counter(screen, HUD_FONT, "High: ", self.highscore, BLACK, (hud_x, 90)),
+        ]
+
+        if self.gato.can_shoot:
+            remaining = max(0, self.gato.shoot_timer_powerup // FPS)
+            rects.append(draw_counter(screen, HUD_FONT, "Power-up: ", remaining, (255, 100, 0), (20, 20), suffix="s"))
+
+        rects.append(draw_progress_map(screen, self.score, self.level))
+
+        if self.boss_active and self.boss:
+            rects.append(draw_boss_hp(screen, self.boss))
+        return [r for r in rects if r is not None]
+
+def merge_rects(rects):
+    """Junta retângulos sobrepostos quando a união não cobre mais área que os dois separados."""
+    merged = []
+    for r in rects:
+        r = pygame.Rect(r)
+        i = 0
+        while i < len(merged):
+            m = merged[i]
+            u = m.union(r)
+            if m.colliderect(r) and u.w * u.h <= m.w * m.h + r.w * r.h:
+                # A união pode agora tocar outros já juntos: recomeça com ela
+                del merged[i]
+                r = u
+                i = 0
+            else:
+                i += 1
+        merged.append(r)
+    return merged
+
+class DirtyRenderer:
+    """Desenho por retângulos sujos: só as zonas alteradas são repostas e enviadas ao ecrã.
+
+    O fundo e o chão ficam fixos (o deslocamento do fundo obrigaria a redesenhar
+    o ecrã inteiro). Em cada frame apaga-se o que foi desenhado no frame anterior,
+    desenham-se entidades e HUD e envia-se a união das duas listas.
+    """
+
+    def __init__(self, nivel, report_file=None):
+        self.nivel = nivel
+        size = (WIDTH, HEIGHT)
+        self.background = pygame.Surface(size).convert()
+        self.background.fill(WHITE)
+        self.background.blit(nivel.bg, (0, 0))
+        self.background.blit(nivel.ground_surface, (0, nivel.ground_y))
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.previous = []
+        self.full = True
+        # Relatório por frame
+        self.frames = 0
+        self.last_rects = 0
+        self.last_area = 0
+        self.total_area = 0
+        self.report = None
+        if report_file:
+            # Acrescenta ao ficheiro (um nível seguido de outro partilha o relatório)
+            self.report = open(report_file, "a", buffering=1)
+            if self.report.tell() == 0:
+                self.report.write("frame,rects,area,fraction\n")
+
+    def invalidate(self):
+        """Obriga a redesenhar o ecrã inteiro no próximo frame (ex.: depois da pausa)."""
+        self.full = True
+
+    def draw(self, screen, alpha=1.0):
+        """Desenha o frame e devolve a lista de retângulos a passar a display.update."""
+        background = self.background
+        if self.full:
+            screen.blit(background, (0, 0))
+        else:
+            for r in self.previous:
+                screen.blit(background, r, r)
+
+        nivel = self.nivel
+        clip = self.screen_rect.clip
+        prof = nivel.profiler
+        current = nivel.draw_sprites(screen, alpha)
+        if prof:
+            prof.lap("desenho")
+        current += nivel.draw_hud(screen)
+        if prof:
+            prof.lap("hud")
+        current = [clip(r) for r in current]
+        current = [r for r in current if r.w and r.h]
+
+        if self.full:
+            dirty = [self.screen_rect.copy()]
+            self.full = False
+        else:
+            dirty = merge_rects(self.previous + current)
+        self.previous = current
+
+        self.frames += 1
+        self.last_rects = len(dirty)
+        self.last_area = sum(r.w * r.h for r in dirty)
+        self.total_area += self.last_area
+        if self.report:
+            fraction = self.last_area / (self.screen_rect.w * self.screen_rect.h)
+            self.report.write(f"{self.frames},{self.last_rects},{self.last_area},{fraction:.4f}\n")
+        return dirty
+
+    def mean_area(self):
+        return self.total_area / self.frames if self.frames else 0.0
+
+    def close(self):
+        if self.report:
+            self.report.close()
+            self.report = None
+
+class ScaledTarget:
+    """Superfície reduzida com a interface de desenho usada pelo nível (fill/blit/blits).
+
+    Recebe coordenadas lógicas (WIDTH x HEIGHT) e desenha versões das imagens
+    reduzidas pela mesma escala, calculadas uma vez por superfície.
+    """
+
+    def __init__(self, scale):
+        self.scale = scale
+        self.surface = pygame.Surface((round(WIDTH * scale), round(HEIGHT * scale))).convert()
+        self.scaled = {}
+
+    def _image(self, image):
+        small = self.scaled.get(image)
+        if small is None:
+            small = self.scaled[image] = pygame.transform.scale_by(image, self.scale)
+        return small
+
+    def fill(self, color):
+        return self.surface.fill(color)
+
+    def blit(self, image, pos):
+        s = self.scale
+        return self.surface.blit(self._image(image), (pos[0] * s, pos[1] * s))
+
+    def blits(self, sequence):
+        return [self.blit(image, pos) for image, pos in sequence]
+
+class ScaledRenderer:
+    """Desenha o cenário numa superfície reduzida e amplia-a para o ecrã.
+
+    O HUD continua a ser desenhado à resolução do ecrã, por cima. Tem a mesma
+    interface que DirtyRenderer (draw devolve os retângulos a atualizar).
+    """
+
+    def __init__(self, nivel, scale=QUALITY_RENDER_SCALE):
+        self.nivel = nivel
+        self.target = ScaledTarget(scale)
+        self.screen_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+
+    def invalidate(self):
+        pass
+
+    def draw(self, screen, alpha=1.0):
+        nivel = self.nivel
+        prof = nivel.profiler
+        nivel.draw_playfield(self.target, alpha)
+        pygame.transform.scale(self.target.surface, screen.get_size(), screen)
+        if prof:
+            prof.lap("desenho")
+        nivel.draw_hud(screen)
+        if prof:
+            prof.lap("hud")
+        return [self.screen_rect.copy()]
+
+    def close(self):
+        self.target.scaled.clear()
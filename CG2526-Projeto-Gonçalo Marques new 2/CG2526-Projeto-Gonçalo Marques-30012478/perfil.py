@@ -0,0 +1,138 @@
+import json
+from time import perf_counter_ns
+from collections import deque
+import pygame
+from configuracoes import *
+
+# Fases medidas, pela ordem do loop (as da simulação somam todos os ticks do frame)
+PROFILE_PHASES = (
+    "eventos", "atualizacoes", "boss", "projeteis", "obstaculos", "powerups", "desenho", "hud", "apresentar",
+)
+# Contagens de entidades mostradas no overlay, uma linha por tuplo
+PROFILE_COUNT_LINES = (("obstaculos", "powerups", "tiros", "ovos"), ("vivas", "desenhadas", "cortadas"))
+PROFILE_COUNTS = sum(PROFILE_COUNT_LINES, ())
+
+def percentiles(values, pcts=(50, 95, 99)):
+    """Percentis (nearest-rank) de uma lista de valores."""
+    ordered = sorted(values)
+    n = len(ordered)
+    if not n:
+        return [0] * len(pcts)
+    return [ordered[max(0, -(-p * n // 100) - 1)] for p in pcts]
+
+class FrameProfiler:
+    """Tempos por fase de cada frame, medidos com perf_counter_ns.
+
+    O loop chama start_frame(), lap(fase) no fim de cada fase e end_frame(counts).
+    Quem instrumenta guarda o profiler num atributo que fica None quando está
+    desligado, por isso sem profiler o custo é só um teste por fase.
+    """
+
+    # Fonte do painel, criada no primeiro desenho e partilhada entre níveis
+    font = None
+
+    def __init__(self, window=PROFILE_WINDOW, export_path=None):
+        self.phase_index = {name: i for i, name in enumerate(PROFILE_PHASES)}
+        self.current = [0] * len(PROFILE_PHASES)
+        self.history = [deque(maxlen=window) for _ in PROFILE_PHASES]
+        self.totals = deque(maxlen=window)
+        self.counts = {}
+        self.frame = 0
+        self.ticks = 0
+        self.frame_start = self.last = perf_counter_ns()
+        self.show_overlay = False
+        self.overlay = None
+        self.export = None
+        self.export_jsonl = False
+        if export_path:
+            self.export_jsonl = export_path.endswith(".jsonl")
+            # Acrescenta ao ficheiro: níveis seguidos partilham a mesma exportação
+            self.export = open(export_path, "a", buffering=1)
+            if not self.export_jsonl and self.export.tell() == 0:
+                header = ["frame", "ticks", "total_ms"] + [f"{p}_ms" for p in PROFILE_PHASES] + list(PROFILE_COUNTS)
+                self.export.write(",".join(header) + "\n")
+
+    def start_frame(self):
+        self.current = [0] * len(PROFILE_PHASES)
+        self.ticks = 0
+        self.frame_start = self.last = perf_counter_ns()
+
+    def lap(self, phase):
+        """Soma à fase o tempo desde a marca anterior."""
+        now = perf_counter_ns()
+        self.current[self.phase_index[phase]] += now - self.last
+        self.last = now
+
+    def mark(self):
+        """Recomeça a contagem sem atribuir o tempo decorrido a nenhuma fase."""
+        self.last = perf_counter_ns()
+
+    def end_frame(self, counts):
+        total = perf_counter_ns() - self.frame_start
+        for hist, ns in zip(self.history, self.current):
+            hist.append(ns)
+        self.totals.append(total)
+        self.counts = counts
+        self.frame += 1
+        if self.export:
+            self._write_row(total)
+        if self.show_overlay and self.frame % PROFILE_OVERLAY_REFRESH == 0:
+            self.overlay = None
+
+    def _write_row(self, total):
+        ms = [ns / 1e6 for ns in self.current]
+        if self.export_jsonl:
+            row = {"frame": self.frame, "ticks": self.ticks, "total_ms": round(total / 1e6, 4)}
+            row.update((f"{p}_ms", round(v, 4)) for p, v in zip(PROFILE_PHASES, ms))
+            row.update(self.counts)
+            self.export.write(json.dumps(row) + "\n")
+        else:
+            values = [self.frame, self.ticks, f"{total / 1e6:.4f}"] + [f"{v:.4f}" for v in ms]
+            values += [self.counts.get(c, 0) for c in PROFILE_COUNTS]
+            self.export.write(",".join(str(v) for v in values) + "\n")
+
+    def summary(self):
+        """[(fase, p50, p95, p99)] em ms sobre a janela deslizante, mais a linha "total"."""
+        rows = [(p, *(v / 1e6 for v in percentiles(h))) for p, h in zip(PROFILE_PHASES, self.history)]
+        rows.append(("total", *(v / 1e6 for v in percentiles(self.totals))))
+        return rows
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self.overlay = None
+
+    def draw_overlay(self, screen, pos=(20, 130)):
+        """Desenha o painel de tempos; devolve a área ocupada (None se estiver escondido)."""
+        if not self.show_overlay:
+            return None
+        if self.overlay is None:
+            self.overlay = self._render_overlay()
+        return screen.blit(self.overlay, pos)
+
+    def _render_overlay(self):
+        # Texto muda a cada atualização: renderizado diretamente, sem passar pela TEXT_CACHE
+        if FrameProfiler.font is None:
+            FrameProfiler.font = pygame.font.SysFont(*PROFILE_FONT)
+        font = FrameProfiler.font
+        color = (230, 230, 230)
+        rows = [("fase (ms)", "p50", "p95", "p99")]
+        rows += [(p, f"{a:.2f}", f"{b:.2f}", f"{c:.2f}") for p, a, b, c in self.summary()]
+        counts = ["  ".join(f"{k}:{self.counts.get(k, 0)}" for k in line) for line in PROFILE_COUNT_LINES]
+        line_h = font.get_linesize()
+        panel = pygame.Surface((420, line_h * (len(rows) + len(counts)) + 12))
+        panel.fill((20, 20, 20))
+        # Colunas alinhadas à direita em posições fixas (a fonte pode não ser monoespaçada)
+        for i, row in enumerate(rows):
+            y = 6 + i * line_h
+            panel.blit(font.render(row[0], True, color), (8, y))
+            for right, cell in zip((240, 320, 400), row[1:]):
+                txt = font.render(cell, True, color)
+                panel.blit(txt, (right - txt.get_width(), y))
+        for i, line in enumerate(counts):
+            panel.blit(font.render(line, True, color), (8, 6 + (len(rows) + i) * line_h))
+        return panel
+
+    def close(self):
+        if self.export:
+            self.export.close()
+            self.export = None
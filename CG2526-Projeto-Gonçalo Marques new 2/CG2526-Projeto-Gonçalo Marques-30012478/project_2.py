@@ -1,169 +1,191 @@
 import pygame
+import os
 import sys
-import random
-import math
+import argparse
+import configuracoes
 from configuracoes import *
 from funcionalidades import (
-    load_image, detect_ground_y_from_bg, create_ground_surface,
-    load_highscore, save_highscore, draw_button, draw_progress_map, draw_boss_hp
-)
-from entidades import (
-    Gato, Projetil, BossProjetil, Tronco, Bird, PowerUp, Boss
+    load_image, get_ground_info, load_highscore, save_highscore, draw_button, render_text
 )
+from nivel import Nivel, DirtyRenderer, ScaledRenderer, load_level_assets
+from qualidade import QualityGovernor
+from perfil import FrameProfiler
+from entrada import InputRecorder, input_to_mask
+
+def save_recording(recorder, nivel, outcome):
+    """Guarda o input gravado do nível como replay em REPLAY_DIR."""
+    from replay import Replay, save_replay, replay_filename
+    directory = configuracoes.REPLAY_DIR
+    os.makedirs(directory, exist_ok=True)
+    replay = Replay(nivel.level, nivel.seed, recorder.runs, recorder.ticks, nivel.score, outcome)
+    save_replay(replay_filename(directory, nivel.level, nivel.seed), replay)
 
 def main_game(screen, start_level=1):
-    """Função principal que executa a lógica do jogo para um nível."""
+    """Função principal que executa a lógica do jogo para um nível.
+
+    A simulação avança em ticks fixos de 1/FPS s (acumulador); o desenho corre
+    à taxa do ecrã, até RENDER_FPS_MAX, interpolando as posições entre ticks.
+    """
     global unlocked_levels
     global GROUND_Y
 
     clock = pygame.time.Clock()
     run = True
 
-    # Carrega background
-    bg = load_image("game_bg.png", (WIDTH, HEIGHT))
-
-    # Detecta posição do chão
-    if MANUAL_GROUND_Y is not None:
-        detected_ground = int(MANUAL_GROUND_Y)
-    else:
-        detected_ground = detect_ground_y_from_bg(bg)
-    GROUND_Y = max(0, detected_ground)
-
-    # Cria superfície verde do chão
-    ground_height = 56
-    ground_surface = create_ground_surface(bg, GROUND_Y, height=ground_height)
-
-    # Instancia o jogador
-    gato = Gato()
-    gato.Y_POS = GROUND_Y - gato.rect.height
-    gato.y = float(gato.Y_POS)
-    gato.rect.topleft = (gato.X_POS, gato.Y_POS)
-
-    # Listas para entidades dinâmicas
-    obstacles = []
-    bullets = []
-    powerups = []
-    boss_bullets = []
-
-    # Variáveis de jogo
-    score = 0
-    speed = 12 + 2 * (start_level - 1)
-    level = start_level
-
-    boss = None
-    boss_active = False
-    paused = False
+    bg, ground_surface, GROUND_Y = load_level_assets()
 
     highscore = load_highscore()
+    level = start_level
+    nivel = Nivel(level, bg, ground_surface, GROUND_Y, highscore)
 
-    bg_x = 0
-    bg_speed = 4
+    # Desenho opcional só das zonas alteradas (fundo fixo)
+    renderer = None
+    if configuracoes.RENDER_MODE == "dirty":
+        renderer = DirtyRenderer(nivel, configuracoes.DIRTY_REPORT_FILE)
 
-    # Temporizadores
-    obstacle_spawn_interval = max(26, 64 - (level - 1) * 6)
-    obstacle_spawn_timer = obstacle_spawn_interval
-    max_obstacles_base = 5
+    # Profiler de fases: ligado por --profile-out ou ao carregar F3
+    profiler = None
+    if configuracoes.PROFILE_EXPORT_FILE:
+        profiler = FrameProfiler(export_path=configuracoes.PROFILE_EXPORT_FILE)
+    nivel.profiler = profiler
 
-    if level == 5:
-        powerup_spawn_interval = 220
-    else:
-        powerup_spawn_interval = 480
-    powerup_spawn_timer = 0
+    # Governador de qualidade (protege o orçamento de frame em máquinas lentas)
+    governor = QualityGovernor() if QUALITY_GOVERNOR else None
 
-    level_distance = LEVEL_DISTANCES.get(level, 1000)
+    # Gravação opcional do input (semente + máscara por tick)
+    recorder = InputRecorder() if configuracoes.REPLAY_DIR else None
+    pending_shots = 0
+    resumed = False
 
-    # Se é boss level, inicializa o boss
-    if math.isinf(level_distance):
-        boss = Boss()
-        boss_active = True
+    paused = False
+    tick_dt = 1.0 / FPS
+    accumulator = 0.0
 
     # LOOP PRINCIPAL DO NÍVEL
-    while run:
-        dt = clock.tick(FPS) / 1000.0
-        mouse = pygame.mouse.get_pos()
-        user_input = pygame.key.get_pressed()
+    next_level = None
+    try:
+        while run:
+            frame_dt = clock.tick(RENDER_FPS_MAX) / 1000.0
+            if profiler:
+                profiler.start_frame()
+            mouse = pygame.mouse.get_pos()
+            user_input = pygame.key.get_pressed()
+
+            # ========== EVENTOS ==========
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    save_highscore(max(nivel.score, highscore))
+                    if recorder:
+                        save_recording(recorder, nivel, "quit")
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_x and not paused:
+                        pending_shots += 1
+                    if event.key == pygame.K_p:
+                        paused = not paused
+                        resumed = not paused
+                    if event.key == pygame.K_F3:
+                        if profiler is None:
+                            profiler = nivel.profiler = FrameProfiler()
+                        profiler.toggle_overlay()
+                        if renderer:
+                            renderer.invalidate()
+
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and paused:
+                    btn_w, btn_h = 260, 70
+                    btn_x = WIDTH // 2 - btn_w // 2
+                    btn_y = HEIGHT // 2 + 50
+                    menu_rect = pygame.Rect(btn_x, btn_y, btn_w, btn_h)
+                    if menu_rect.collidepoint(event.pos):
+                        save_highscore(max(nivel.score, highscore))
+                        if recorder:
+                            save_recording(recorder, nivel, "quit")
+                        return
+
+            if profiler:
+                profiler.lap("eventos")
+
+            # ========== PAUSA ==========
+            if paused:
+                accumulator = 0.0
+                screen.fill((0, 0, 0))
+                pause_txt = render_text(TITLE_FONT, "PAUSADO", WHITE)
+                instr_txt = render_text(HUD_FONT, "P: Continuar", WHITE)
+                screen.blit(pause_txt, (WIDTH // 2 - pause_txt.get_width() // 2, HEIGHT // 2 - 180))
+                screen.blit(instr_txt, (WIDTH // 2 - instr_txt.get_width() // 2, HEIGHT // 2 - 110))
 
-        # ========== EVENTOS ==========
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                save_highscore(max(score, highscore))
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_x and gato.can_shoot and not paused:
-                    gato.shoot()
-                    bullets.append(Projetil(gato.rect.right, gato.rect.centery))
-                if event.key == pygame.K_p:
-                    paused = not paused
-
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and paused:
                 btn_w, btn_h = 260, 70
                 btn_x = WIDTH // 2 - btn_w // 2
                 btn_y = HEIGHT // 2 + 50
-                menu_rect = pygame.Rect(btn_x, btn_y, btn_w, btn_h)
-                if menu_rect.collidepoint(event.pos):
-                    save_highscore(max(score, highscore))
-                    return
-
-        # ========== PAUSA ==========
-        if paused:
-            screen.fill((0, 0, 0))
-            pause_txt = TITLE_FONT.render("PAUSADO", True, WHITE)
-            instr_txt = HUD_FONT.render("P: Continuar", True, WHITE)
-            screen.blit(pause_txt, (WIDTH // 2 - pause_txt.get_width() // 2, HEIGHT // 2 - 180))
-            screen.blit(instr_txt, (WIDTH // 2 - instr_txt.get_width() // 2, HEIGHT // 2 - 110))
+                menu_rect = (btn_x, btn_y, btn_w, btn_h)
+                draw_button(screen, menu_rect, "Voltar ao Menu", PRIMARY, PRIMARY_HOVER, mouse)
 
-            btn_w, btn_h = 260, 70
-            btn_x = WIDTH // 2 - btn_w // 2
-            btn_y = HEIGHT // 2 + 50
-            menu_rect = (btn_x, btn_y, btn_w, btn_h)
-            draw_button(screen, menu_rect, "Voltar ao Menu", PRIMARY, PRIMARY_HOVER, mouse)
-
-            pygame.display.update()
-            continue
-
-        # ========== ATUALIZAÇÕES ==========
-        gato.update(user_input)
+                pygame.display.update()
+                if renderer:
+                    renderer.invalidate()
+                continue
 
-        # Verifica se completou o nível
-        if not math.isinf(level_distance) and score >= level_distance:
-            if level + 1 > unlocked_levels:
-                unlocked_levels = level + 1
-                from configuracoes import save_unlocked_levels
-                save_unlocked_levels()  # SALVA O PROGRESSO
-            save_highscore(max(score, highscore))
+            # ========== QUALIDADE ==========
+            # get_rawtime: tempo de trabalho do último frame, sem a espera do limite de FPS
+            if governor and governor.record(clock.get_rawtime()):
+                governor.apply(nivel)
+                # Última etapa: cenário desenhado a escala reduzida e ampliado (no modo
+                # "dirty" o fundo já é fixo e só se enviam as zonas alteradas)
+                if configuracoes.RENDER_MODE == "full":
+                    if governor.reduced("render_scale") and not renderer:
+                        renderer = ScaledRenderer(nivel)
+                    elif not governor.reduced("render_scale") and renderer:
+                        renderer.close()
+                        renderer = None
+
+            # ========== SIMULAÇÃO (ticks fixos) ==========
+            accumulator += frame_dt
+            steps = 0
+            outcome = None
+            while accumulator >= tick_dt and steps < MAX_TICKS_PER_FRAME:
+                # Cada tick recebe no máximo um disparo, para o replay o poder reproduzir
+                taps = []
+                if pending_shots:
+                    pending_shots -= 1
+                    nivel.request_shot()
+                    taps.append(pygame.K_x)
+                if resumed:
+                    resumed = False
+                    taps.append(pygame.K_p)
+                if recorder:
+                    recorder.record(input_to_mask(user_input, taps))
+                outcome = nivel.tick(user_input)
+                accumulator -= tick_dt
+                steps += 1
+                if outcome:
+                    break
+            if steps == MAX_TICKS_PER_FRAME:
+                # Máquina demasiado lenta: descarta o atraso em vez de acumular
+                accumulator = min(accumulator, tick_dt)
+
+            score = nivel.score
+            if outcome and recorder:
+                save_recording(recorder, nivel, outcome)
+
+            if outcome == "complete":
+                if level + 1 > unlocked_levels:
+                    unlocked_levels = level + 1
+                    from configuracoes import save_unlocked_levels
+                    save_unlocked_levels()  # SALVA O PROGRESSO
+                save_highscore(max(score, highscore))
             
-            has_next_level = (level < 5)
+                has_next_level = (level < 5)
             
-            from interfaces import level_complete_screen
-            escolha = level_complete_screen(screen, level, score, max(score, highscore), has_next_level)
+                from interfaces import level_complete_screen
+                escolha = level_complete_screen(screen, level, score, max(score, highscore), has_next_level)
             
-            if escolha == "next" and has_next_level:
-                main_game(screen, start_level=level + 1)
-                return
-            else:
-                return
-
-        # ========== LÓGICA DO BOSS ==========
-        if boss_active and boss:
-            boss.update(gato.rect)
-
-            if boss.should_shoot_now():
-                on_ground = (boss.rect.bottom >= GROUND_Y - 2)
-                offset_y = random.randint(-34, 34)
-                bullet_y = boss.rect.centery + offset_y
-
-                if on_ground:
-                    vx = -13
-                    vy = 0
-                else:
-                    dy = (gato.rect.centery - boss.rect.centery)
-                    vy = max(min(dy * 0.06, 8), -2)
-                    vx = -10
-                spawn_x = boss.rect.left - 20
-                boss_bullets.append(BossProjetil(spawn_x, bullet_y, vx=vx, vy=vy))
+                if escolha == "next" and has_next_level:
+                    # O nível seguinte só começa depois de este fechar (finally)
+                    next_level = level + 1
+                break
 
-            if boss.hp <= 0:
+            if outcome == "victory":
                 unlocked_levels = max(unlocked_levels, 5)
                 from configuracoes import save_unlocked_levels
                 save_unlocked_levels()  # SALVA QUE DESBLOQUEOU O BOSS
@@ -173,169 +195,80 @@ def main_game(screen, start_level=1):
                 victory_screen(screen, score, max(score, highscore))
                 return
 
-            if gato.rect.colliderect(boss.get_collision_rect()):
-                pygame.time.delay(300)
+            if outcome in ("boss", "boss_bullet", "obstacle"):
+                pygame.time.delay(200 if outcome == "boss_bullet" else 300)
                 save_highscore(max(score, highscore))
                 from interfaces import death_screen
                 death_screen(screen, score, max(score, highscore))
                 return
 
-        # ========== PROJÉTEIS ==========
-        for bullet in bullets[:]:
-            bullet.update()
-
-            hit_bullet = False
-            for b_b in boss_bullets[:]:
-                if bullet.rect.colliderect(b_b.rect):
-                    if bullet in bullets:
-                        bullets.remove(bullet)
-                    if b_b in boss_bullets:
-                        boss_bullets.remove(b_b)
-                    hit_bullet = True
-                    break
-            if hit_bullet:
-                continue
-
-            if boss_active and boss and bullet.rect.colliderect(boss.get_collision_rect()):
-                boss.take_hit(from_state=boss.state)
-                if bullet in bullets:
-                    bullets.remove(bullet)
-                continue
-
-            hit = False
-            for obstacle in obstacles[:]:
-                if bullet.rect.colliderect(obstacle.rect):
-                    if bullet in bullets:
-                        bullets.remove(bullet)
-                    if obstacle in obstacles:
-                        obstacles.remove(obstacle)
-                    hit = True
-                    break
-            if hit:
-                continue
-
-            if bullet.rect.x > WIDTH + 200 and bullet in bullets:
-                bullets.remove(bullet)
-
-        for b_bullet in boss_bullets[:]:
-            b_bullet.update()
-            if b_bullet.rect.colliderect(gato.rect):
-                pygame.time.delay(200)
-                save_highscore(max(score, highscore))
-                from interfaces import death_screen
-                death_screen(screen, score, max(score, highscore))
-                return
-            if b_bullet.rect.right < -50 or b_bullet.rect.top > HEIGHT + 200 or b_bullet.rect.bottom < -200:
-                if b_bullet in boss_bullets:
-                    boss_bullets.remove(b_bullet)
-
-        # ========== OBSTÁCULOS ==========
-        if not boss_active:
-            obstacle_spawn_timer -= 1
-            if obstacle_spawn_timer <= 0:
-                max_obstacles = max_obstacles_base + level
-                min_spacing = int(WIDTH * max(0.18, 0.35 - 0.03 * (level - 1)))
-                rightmost = max((obs.rect.right for obs in obstacles), default=-9999)
-                if len(obstacles) < max_obstacles and rightmost <= WIDTH - min_spacing:
-                    bird_prob = min(0.5, 0.12 + 0.06 * (level - 1))
-                    if level >= 3:
-                        bird_prob = min(0.45, bird_prob + 0.06)
-                    if random.random() < bird_prob:
-                        obstacles.append(Bird())
-                    else:
-                        obstacles.append(Tronco())
-
-                base_interval = max(22, 70 - level * 8)
-                obstacle_spawn_interval = base_interval + random.randint(-8, 12)
-                obstacle_spawn_interval = max(18, obstacle_spawn_interval - (score // 2000))
-                obstacle_spawn_timer = obstacle_spawn_interval
-
-            for obstacle in obstacles[:]:
-                obstacle.update(speed)
-                if gato.rect.colliderect(obstacle.rect):
-                    pygame.time.delay(300)
-                    save_highscore(max(score, highscore))
-                    from interfaces import death_screen
-                    death_screen(screen, score, max(score, highscore))
-                    return
-                if obstacle.rect.x < -200 and obstacle in obstacles:
-                    obstacles.remove(obstacle)
-
-        # ========== POWERUPS ==========
-        powerup_spawn_timer -= 1
-        if powerup_spawn_timer <= 0 and len(powerups) == 0:
-            if math.isinf(level_distance):
-                chance = 1
+            # ========== DESENHO ==========
+            alpha = accumulator / tick_dt
+            if governor and governor.reduced("interpolation"):
+                alpha = 1.0
+            if renderer:
+                rects = renderer.draw(screen, alpha)
+                if profiler and profiler.show_overlay:
+                    rects.append(profiler.draw_overlay(screen))
+                pygame.display.update(rects)
             else:
-                chance = 3
-            if random.randint(0, chance) == 0:
-                powerups.append(PowerUp())
-            powerup_spawn_timer = powerup_spawn_interval
-
-        for p in powerups[:]:
-            p.update(speed)
-            if gato.rect.colliderect(p.rect):
-                gato.activate_powerup(10)
-                powerups.remove(p)
-            elif p.rect.right < -100:
-                powerups.remove(p)
-
-        # ========== DESENHO ==========
-        bg_x -= bg_speed
-        if bg_x <= -WIDTH:
-            bg_x = 0
-
-        screen.fill(WHITE)
-        screen.blit(bg, (bg_x, 0))
-        screen.blit(bg, (bg_x + WIDTH, 0))
-        screen.blit(ground_surface, (bg_x, GROUND_Y))
-        screen.blit(ground_surface, (bg_x + WIDTH, GROUND_Y))
-
-        gato.draw(screen)
-        for b in bullets:
-            b.draw(screen)
-        for b_b in boss_bullets:
-            b_b.draw(screen)
-        for obstacle in obstacles:
-            obstacle.draw(screen)
-        for p in powerups:
-            p.draw(screen)
-        if boss_active and boss:
-            boss.draw(screen)
-
-        score += 1
-
-        # HUD
-        score_text = HUD_FONT.render(f"Score: {score}", True, BLACK)
-        level_text = HUD_FONT.render(f"Level: {level}", True, BLACK)
-        high_text = HUD_FONT.render(f"High: {highscore}", True, BLACK)
-        hud_x = WIDTH - 260
-        screen.blit(score_text, (hud_x, 20))
-        screen.blit(level_text, (hud_x, 55))
-        screen.blit(high_text, (hud_x, 90))
-
-        if gato.can_shoot:
-            remaining = max(0, gato.shoot_timer_powerup // FPS)
-            p_txt = HUD_FONT.render(f"Power-up: {remaining}s", True, (255, 100, 0))
-            screen.blit(p_txt, (20, 20))
-
-        draw_progress_map(screen, score, level)
-
-        if boss_active and boss:
-            draw_boss_hp(screen, boss)
-
-        pygame.display.update()
+                nivel.draw(screen, alpha)
+                if profiler:
+                    profiler.draw_overlay(screen)
+                pygame.display.update()
+            if profiler:
+                profiler.lap("apresentar")
+                profiler.end_frame(nivel.entity_counts())
+    finally:
+        # Qualquer saída do nível (menu da pausa, fim, sair) fecha o relatório do
+        # renderer e a exportação do profiler
+        if renderer:
+            renderer.close()
+        if profiler:
+            profiler.close()
+
+    if next_level:
+        main_game(screen, start_level=next_level)
 
 # Ponto de entrada principal
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Super Cat Runner")
+    parser.add_argument("--rebuild-ground-cache", action="store_true",
+                        help="refaz a deteção do chão e reescreve a cache em disco")
+    parser.add_argument("--record", metavar="PASTA", default=None,
+                        help="grava um replay de cada nível jogado nesta pasta")
+    parser.add_argument("--dirty", action="store_true",
+                        help="desenha só as zonas alteradas do ecrã; o fundo deixa de "
+                             "deslizar (troca o efeito de movimento por menos área enviada)")
+    parser.add_argument("--dirty-report", metavar="FICHEIRO", default=None,
+                        help="com --dirty, escreve a área enviada ao ecrã em cada frame (CSV)")
+    parser.add_argument("--profile-out", metavar="FICHEIRO", default=None,
+                        help="liga o profiler e escreve os tempos de cada frame (.csv ou .jsonl)")
+    parser.add_argument("--entity-store", choices=("objects", "numpy"), default=None,
+                        help="contentor das entidades: um objeto por entidade ou arrays NumPy")
+    args = parser.parse_args()
+    configuracoes.REPLAY_DIR = args.record
+    configuracoes.PROFILE_EXPORT_FILE = args.profile_out
+    if args.entity_store:
+        configuracoes.ENTITY_STORE = args.entity_store
+    if args.dirty:
+        configuracoes.RENDER_MODE = "dirty"
+        configuracoes.DIRTY_REPORT_FILE = args.dirty_report
+
     # Inicializa pygame
     pygame.init()
     
-    # Cria a janela em fullscreen
-    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+    # Cria a janela em fullscreen (à resolução lógica, escalada para o monitor)
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), DISPLAY_FLAGS)
     pygame.display.set_caption("Super Cat Runner")
+
+    if args.rebuild_ground_cache:
+        get_ground_info("game_bg.png", load_image("game_bg.png", (WIDTH, HEIGHT)), rebuild=True)
     
+    # Começa a carregar os assets de jogo enquanto o menu já responde
+    from carregamento import start_preload
+    start_preload()
+
     # Importa e inicia o menu
     from interfaces import menu
     menu(screen)
-
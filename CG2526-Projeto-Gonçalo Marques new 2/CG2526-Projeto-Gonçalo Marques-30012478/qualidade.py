@@ -0,0 +1,104 @@
+import math
+from collections import deque
+from configuracoes import *
+
+# Reduções aplicadas por ordem, da menos visível para a mais visível
+QUALITY_STAGES = ("boss_flash", "interpolation", "render_scale")
+
+def percentile(samples, pct):
+    """Percentil pct (0-100) de uma sequência de amostras (método nearest-rank)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+class QualityGovernor:
+    """Baixa a qualidade visual por etapas quando o tempo de frame excede o orçamento.
+
+    Observa uma janela deslizante dos tempos de frame e compara o percentil
+    QUALITY_PERCENTILE com QUALITY_FRAME_BUDGET_MS: acima do orçamento desce
+    uma etapa, abaixo de QUALITY_HEADROOM * orçamento volta a subir. Depois de
+    cada mudança a janela recomeça, para medir só frames da nova qualidade.
+    Nenhuma etapa altera a simulação (hitboxes, ticks), apenas o desenho.
+
+    Para não oscilar entre duas etapas, guarda o percentil medido no nível de
+    onde desceu e, na primeira janela do nível seguinte, o custo extra do de
+    cima (a diferença). Só sobe se o percentil atual mais esse custo, escalado
+    pela carga atual, couber no orçamento. Depois de descer espera
+    QUALITY_COOLDOWN frames, e o dobro a cada oscilação seguida.
+    """
+
+    def __init__(self, budget_ms=QUALITY_FRAME_BUDGET_MS, window=QUALITY_WINDOW,
+                 pct=QUALITY_PERCENTILE, headroom=QUALITY_HEADROOM,
+                 cooldown=QUALITY_COOLDOWN, backoff_max=QUALITY_BACKOFF_MAX):
+        self.budget_ms = budget_ms
+        self.pct = pct
+        self.headroom = headroom
+        self.samples = deque(maxlen=window)
+        self.level = 0
+        self.changes = 0
+        self.left_at = None     # (nível, percentil) de onde se desceu por último
+        self.extra = {}         # nível -> (custo extra em ms, percentil do nível abaixo)
+        self.cooldown = cooldown
+        self.backoff = 1
+        self.backoff_max = backoff_max
+        self.frame = 0
+        self.hold_until = 0     # frame antes do qual não se sobe
+        self.last_up = None     # frame da última subida
+
+    def reduced(self, stage):
+        """True se a redução `stage` está ativa no nível atual."""
+        return self.level > QUALITY_STAGES.index(stage)
+
+    def record(self, frame_ms):
+        """Regista o tempo de um frame; devolve True se o nível de qualidade mudou."""
+        self.frame += 1
+        samples = self.samples
+        samples.append(frame_ms)
+        if len(samples) < samples.maxlen:
+            return False
+        p = percentile(samples, self.pct)
+        if self.left_at and self.left_at[0] == self.level - 1:
+            self.extra[self.level - 1] = (max(0.0, self.left_at[1] - p), p)
+        self.left_at = None
+        if p > self.budget_ms and self.level < len(QUALITY_STAGES):
+            self._step_down(p)
+        elif p < self.budget_ms * self.headroom and self.level > 0 and self._can_step_up(p):
+            self.level -= 1
+            self.last_up = self.frame
+        else:
+            return False
+        samples.clear()
+        self.changes += 1
+        return True
+
+    def _step_down(self, p):
+        # Descer logo depois de subir é uma oscilação: o cooldown seguinte dobra;
+        # descer muito depois da última subida recomeça do cooldown base
+        if self.last_up is not None:
+            if self.frame - self.last_up <= self.cooldown * self.backoff:
+                self.backoff = min(self.backoff * 2, self.backoff_max)
+            else:
+                self.backoff = 1
+        self.last_up = None
+        self.left_at = (self.level, p)
+        self.level += 1
+        self.hold_until = self.frame + self.cooldown * self.backoff
+
+    def _can_step_up(self, p):
+        """True se o nível acima, estimado pelo que custou da última vez, cabe no orçamento."""
+        if self.frame < self.hold_until:
+            return False
+        known = self.extra.get(self.level - 1)
+        if known is None:
+            return True
+        # O custo de uma etapa cresce com a carga (mais entidades, mais desenho)
+        extra, reference = known
+        if reference > 0:
+            extra *= p / reference
+        return p + extra <= self.budget_ms
+
+    def apply(self, nivel):
+        """Passa ao nível as opções de desenho que dependem da qualidade atual."""
+        nivel.boss_flash = not self.reduced("boss_flash")
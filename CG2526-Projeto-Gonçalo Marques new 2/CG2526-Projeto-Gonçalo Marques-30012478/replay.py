@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import struct
+import argparse
+
+if __name__ == "__main__":
+    # A reprodução rápida não abre janela; só --realtime precisa do ecrã verdadeiro
+    if "--realtime" not in sys.argv:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from configuracoes import *
+from entrada import ReplayInput
+from funcionalidades import load_highscore
+
+# Formato: cabeçalho fixo + runs (máscara: 1 byte, comprimento: varint LEB128)
+REPLAY_MAGIC = b"SCRR"
+# Versão 2: remoção fora do ecrã com margem única (DESPAWN_MARGIN), o que muda a simulação
+# Versão 3: alturas dos troncos igualmente espaçadas (size_steps), a mesma seed dá outros troncos
+REPLAY_VERSION = 3
+REPLAY_HEADER = struct.Struct("<4sBBHHqIIB")
+
+OUTCOMES = ("timeout", "complete", "victory", "obstacle", "boss_bullet", "boss", "quit")
+
+class Replay:
+    """Gravação de um nível: semente, resolução, resultado e input por tick."""
+
+    def __init__(self, level, seed, runs, ticks, score=0, outcome="timeout", size=(WIDTH, HEIGHT)):
+        self.level = level
+        self.seed = seed
+        self.runs = runs
+        self.ticks = ticks
+        self.score = score
+        self.outcome = outcome
+        self.size = tuple(size)
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+def encode_replay(replay):
+    """Serializa um Replay para bytes."""
+    out = bytearray(REPLAY_HEADER.pack(
+        REPLAY_MAGIC, REPLAY_VERSION, replay.level, replay.size[0], replay.size[1],
+        replay.seed, replay.ticks, replay.score, OUTCOMES.index(replay.outcome),
+    ))
+    for mask, count in replay.runs:
+        out.append(mask)
+        _write_varint(out, count)
+    return bytes(out)
+
+def decode_replay(data):
+    """Lê bytes produzidos por encode_replay."""
+    magic, version, level, w, h, seed, ticks, score, outcome = REPLAY_HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError("Ficheiro de replay inválido ou de outra versão")
+    runs = []
+    pos = REPLAY_HEADER.size
+    while pos < len(data):
+        mask = data[pos]
+        count, pos = _read_varint(data, pos + 1)
+        runs.append((mask, count))
+    return Replay(level, seed, runs, ticks, score, OUTCOMES[outcome], (w, h))
+
+def save_replay(path, replay):
+    try:
+        with open(path, "wb") as f:
+            f.write(encode_replay(replay))
+    except Exception as e:
+        print("Erro ao salvar replay:", e)
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        return decode_replay(f.read())
+
+def replay_filename(directory, level, seed):
+    return os.path.join(directory, f"replay_L{level}_{seed}.scr")
+
+def _check_size(replay):
+    if replay.size != (WIDTH, HEIGHT):
+        print(f"Aviso: replay gravado a {replay.size[0]}x{replay.size[1]}, "
+              f"ecrã atual {WIDTH}x{HEIGHT}; a simulação pode divergir.")
+
+def play_fast(replay):
+    """Re-simula o replay sem desenhar, à velocidade máxima."""
+    from simulacao import run_headless
+    _check_size(replay)
+    return run_headless(replay.level, ReplayInput(replay.runs), replay.seed, replay.ticks)
+
+def play_realtime(replay):
+    """Reproduz o replay a 1x, desenhando cada tick numa janela."""
+    from nivel import Nivel, load_level_assets
+    _check_size(replay)
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED if RENDER_SIZE else 0)
+    pygame.display.set_caption("Super Cat Runner - replay")
+    clock = pygame.time.Clock()
+
+    bg, ground_surface, ground_y = load_level_assets()
+    nivel = Nivel(replay.level, bg, ground_surface, ground_y, seed=replay.seed)
+    source = ReplayInput(replay.runs)
+    outcome = None
+    while nivel.ticks < replay.ticks and not outcome:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return {"ticks": nivel.ticks, "score": nivel.score, "outcome": "quit"}
+        user_input, taps = source.poll(nivel.ticks)
+        if pygame.K_x in taps:
+            nivel.request_shot()
+        outcome = nivel.tick(user_input)
+        nivel.draw(screen)
+        pygame.display.update()
+        clock.tick(FPS)
+    return {"ticks": nivel.ticks, "score": nivel.score, "outcome": outcome or "timeout"}
+
+def verify(replay):
+    """Re-simula e confirma se a pontuação e o resultado gravados se reproduzem."""
+    result = play_fast(replay)
+    # Um nível abandonado pelo menu termina, na re-simulação, por falta de input
+    expected = "timeout" if replay.outcome == "quit" else replay.outcome
+    ok = result["score"] == replay.score and result["outcome"] == expected
+    return ok, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprodução e verificação de replays")
+    sub = parser.add_subparsers(dest="command", required=True)
+    play = sub.add_parser("play", help="reproduz um replay")
+    play.add_argument("file")
+    play.add_argument("--realtime", action="store_true", help="desenha a 1x em vez de simular à velocidade máxima")
+    check = sub.add_parser("verify", help="re-simula e confirma o resultado gravado")
+    check.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "play":
+        replay = load_replay(args.file)
+        if args.realtime:
+            result = play_realtime(replay)
+        else:
+            pygame.display.set_mode((1, 1))
+            result = play_fast(replay)
+        print(json.dumps(result, indent=2))
+        return 0
+
+    pygame.display.set_mode((1, 1))
+    highscore = load_highscore()
+    failures = 0
+    highscore_verified = False
+    for path in args.files:
+        replay = load_replay(path)
+        ok, result = verify(replay)
+        failures += not ok
+        highscore_verified = highscore_verified or (ok and replay.score == highscore)
+        status = "OK" if ok else "FALHOU"
+        print(f"{path}: {status} gravado={replay.score}/{replay.outcome} "
+              f"simulado={result['score']}/{result['outcome']}")
+    if highscore_verified:
+        print(f"Highscore {highscore} confirmado por re-simulação.")
+    else:
+        print(f"Nenhum replay válido reproduz o highscore {highscore}.")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import os
+import time
+import argparse
+
+if __name__ == "__main__":
+    # Sem janela: o driver "dummy" do SDL tem de ser escolhido antes de iniciar o pygame
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import configuracoes
+from entrada import ScriptedInput
+from nivel import Nivel, load_level_assets
+
+# Guião por omissão: salta periodicamente e dispara sempre que pode
+DEFAULT_SCRIPT = "w@0-8/45,x@0/12"
+
+def init_headless_display():
+    """Garante uma superfície de ecrã (necessária para convert/convert_alpha)."""
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+def run_headless(level=1, input_source=None, seed=None, max_ticks=36000):
+    """Corre a lógica de um nível sem desenhar e sem limite de velocidade.
+
+    Devolve um dicionário com ticks, ticks/s, pontuação final e causa do fim
+    ("complete", "victory", "obstacle", "boss_bullet", "boss" ou "timeout").
+    """
+    init_headless_display()
+    if input_source is None:
+        input_source = ScriptedInput.parse(DEFAULT_SCRIPT)
+
+    bg, ground_surface, ground_y = load_level_assets()
+    nivel = Nivel(level, bg, ground_surface, ground_y, seed=seed)
+
+    outcome = None
+    start = time.perf_counter()
+    while nivel.ticks < max_ticks:
+        user_input, taps = input_source.poll(nivel.ticks)
+        if pygame.K_x in taps:
+            nivel.request_shot()
+        outcome = nivel.tick(user_input)
+        if outcome:
+            break
+    elapsed = time.perf_counter() - start
+
+    return {
+        "level": level,
+        "seed": nivel.seed,
+        "ticks": nivel.ticks,
+        "seconds": elapsed,
+        "ticks_per_second": nivel.ticks / elapsed if elapsed > 0 else float("inf"),
+        "score": nivel.score,
+        "outcome": outcome or "timeout",
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação sem ecrã (headless) de um nível")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--ticks", type=int, default=36000, help="máximo de ticks a simular")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT,
+                        help='guião de input, ex.: "w@0-8/45,x@0/12" (tecla@início-fim/período)')
+    parser.add_argument("--assets", action="store_true",
+                        help="mostra o formato (opaque/colorkey/alpha) escolhido para cada imagem")
+    parser.add_argument("--entity-store", choices=("objects", "numpy"), default=None,
+                        help="contentor das entidades: um objeto por entidade ou arrays NumPy")
+    args = parser.parse_args(argv)
+    if args.entity_store:
+        configuracoes.ENTITY_STORE = args.entity_store
+
+    result = run_headless(args.level, ScriptedInput.parse(args.script), args.seed, args.ticks)
+    print(f"Nível {result['level']} (seed {result['seed']}): {result['outcome']} após {result['ticks']} ticks "
+          f"({result['ticks_per_second']:.0f} ticks/s), score {result['score']}")
+    if args.assets:
+        from funcionalidades import image_load_report
+        for path, size, flip_x, flip_y, mode in image_load_report():
+            size_txt = f"{size[0]}x{size[1]}" if size else "original"
+            print(f"  {path:<22} {size_txt:>10}{' flip' if flip_x or flip_y else '':5}  {mode}")
+    return result
+
+if __name__ == "__main__":
+    main()
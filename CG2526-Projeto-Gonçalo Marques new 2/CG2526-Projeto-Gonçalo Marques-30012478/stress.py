@@ -0,0 +1,141 @@
+import os
+import csv
+import argparse
+
+if __name__ == "__main__":
+    # Sem janela: o driver "dummy" do SDL tem de ser escolhido antes de iniciar o pygame
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import configuracoes
+from configuracoes import *
+from entrada import ScriptedInput
+from entidades import Projetil, BossProjetil
+from nivel import Nivel, load_level_assets
+from perfil import FrameProfiler, PROFILE_PHASES, percentiles
+from simulacao import DEFAULT_SCRIPT, init_headless_display
+
+# Fases que contam como atualização e como desenho em cada passo da curva
+UPDATE_PHASES = ("atualizacoes", "boss", "projeteis", "obstaculos", "powerups")
+DRAW_PHASES = ("desenho", "hud")
+
+STRESS_STEP_TICKS = 300
+STRESS_GROWTH = 1.5
+STRESS_MAX_STEPS = 20
+# Acima deste multiplicador o spawn normal (no máximo um por tick) satura: cria-se mais por tick
+STRESS_SPAWNS_PER_TICK_AT = 20
+
+def flood_eggs(nivel, count):
+    """Dispara `count` ovos do boss neste tick, com alturas e velocidades sorteadas."""
+    boss = nivel.boss
+    rng = nivel.rng.boss
+    for _ in range(count):
+        y = rng.randint(0, int(nivel.ground_y))
+        if nivel.boss_bullets.spawn(boss.rect.left - 20, y, vx=-rng.randint(6, 16), vy=rng.uniform(-2, 2)) is None:
+            break
+
+def run_step(assets, mode, multiplier, ticks, seed):
+    """Corre um passo com a carga `multiplier`; devolve uma linha da curva."""
+    bg, ground_surface, ground_y = assets
+    if mode == "boss":
+        nivel = Nivel(5, bg, ground_surface, ground_y, seed=seed, invulnerable=True)
+        eggs_per_tick = max(1, int(multiplier))
+        # Ovos vivem ~WIDTH/6 ticks no máximo: a pool tem de caber a inundação inteira
+        nivel.boss_bullets = type(nivel.boss_bullets)(BossProjetil, eggs_per_tick * (WIDTH // 6 + 60))
+        nivel.gato.activate_powerup(10 ** 6)
+        script = "x@0/2,w@0-8/45"
+    else:
+        nivel = Nivel(4, bg, ground_surface, ground_y, seed=seed, invulnerable=True, spawn_scale=multiplier)
+        # Mais tiros em simultâneo quando a carga sobe
+        nivel.bullets = type(nivel.bullets)(Projetil, int(PLAYER_BULLET_POOL_SIZE * multiplier))
+        nivel.gato.activate_powerup(10 ** 6)
+        eggs_per_tick = 0
+        script = DEFAULT_SCRIPT
+    extra_spawns = int(multiplier // STRESS_SPAWNS_PER_TICK_AT) if mode == "obstacles" else 0
+
+    prof = FrameProfiler(window=ticks)
+    nivel.profiler = prof
+    target = pygame.Surface((WIDTH, HEIGHT)).convert()
+    source = ScriptedInput.parse(script)
+    entities = []
+    drawn = []
+    for _ in range(ticks):
+        prof.start_frame()
+        user_input, taps = source.poll(nivel.ticks)
+        if pygame.K_x in taps:
+            nivel.request_shot()
+        if eggs_per_tick:
+            flood_eggs(nivel, eggs_per_tick)
+        for _ in range(extra_spawns):
+            nivel.spawn_obstacle()
+        prof.mark()
+        if nivel.tick(user_input) == "complete":
+            break
+        nivel.draw(target, 1.0)
+        counts = nivel.entity_counts()
+        entities.append(counts["vivas"])
+        drawn.append(counts["desenhadas"])
+        prof.end_frame(counts)
+
+    n = len(entities)
+    phase_mean = {p: sum(h) / max(1, len(h)) / 1e6 for p, h in zip(PROFILE_PHASES, prof.history)}
+    p95_total = percentiles(prof.totals, (95,))[0] / 1e6
+    row = {
+        "mode": mode,
+        "multiplier": round(multiplier, 3),
+        "eggs_per_tick": eggs_per_tick,
+        "entities_mean": round(sum(entities) / max(1, n), 1),
+        "entities_max": max(entities, default=0),
+        "drawn_mean": round(sum(drawn) / max(1, n), 1),
+        "update_ms": round(sum(phase_mean[p] for p in UPDATE_PHASES), 4),
+        "draw_ms": round(sum(phase_mean[p] for p in DRAW_PHASES), 4),
+        "p95_frame_ms": round(p95_total, 4),
+    }
+    for p in UPDATE_PHASES + DRAW_PHASES:
+        row[f"{p}_ms"] = round(phase_mean[p], 4)
+    return row
+
+def run_stress(mode="obstacles", budget_ms=1000.0 / FPS, step_ticks=STRESS_STEP_TICKS,
+               growth=STRESS_GROWTH, max_steps=STRESS_MAX_STEPS, seed=1234):
+    """Aumenta a carga por passos até o p95 do frame (update + desenho) passar o orçamento."""
+    init_headless_display()
+    assets = load_level_assets()
+    rows = []
+    multiplier = 1.0
+    for _ in range(max_steps):
+        row = run_step(assets, mode, multiplier, step_ticks, seed)
+        rows.append(row)
+        print(f"x{row['multiplier']:<7} {row['entities_mean']:>7.1f} entidades ({row['drawn_mean']:>6.1f} desenhadas)  update {row['update_ms']:>7.3f} ms  "
+              f"desenho {row['draw_ms']:>7.3f} ms  p95 {row['p95_frame_ms']:>7.3f} ms")
+        if row["p95_frame_ms"] > budget_ms:
+            print(f"Orçamento de {budget_ms:.1f} ms excedido com x{row['multiplier']} "
+                  f"({row['entities_mean']:.0f} entidades em média).")
+            break
+        multiplier *= growth
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga: sobe o nº de entidades até exceder o orçamento")
+    parser.add_argument("--mode", choices=("obstacles", "boss"), default="obstacles",
+                        help="obstacles: multiplica spawns e limites; boss: inunda o nível 5 de ovos")
+    parser.add_argument("--budget-ms", type=float, default=1000.0 / FPS)
+    parser.add_argument("--step-ticks", type=int, default=STRESS_STEP_TICKS)
+    parser.add_argument("--growth", type=float, default=STRESS_GROWTH, help="fator de carga entre passos")
+    parser.add_argument("--max-steps", type=int, default=STRESS_MAX_STEPS)
+    parser.add_argument("--out", metavar="FICHEIRO", help="guarda a curva em CSV")
+    parser.add_argument("--entity-store", choices=("objects", "numpy"), default=None,
+                        help="contentor das entidades: um objeto por entidade ou arrays NumPy")
+    args = parser.parse_args(argv)
+    if args.entity_store:
+        configuracoes.ENTITY_STORE = args.entity_store
+
+    rows = run_stress(args.mode, args.budget_ms, args.step_ticks, args.growth, args.max_steps)
+    if args.out and rows:
+        with open(args.out, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    return rows
+
+if __name__ == "__main__":
+    main()